@@ -1,49 +1,209 @@
-def main():
-    curr_num = 50
+import sys
+import time
+
+import numpy as np
+
+# Size of the dial: positions run from 0 to DIAL_SIZE - 1
+DIAL_SIZE = 100
+
+# Number of bytes read from the input at a time when streaming instructions
+CHUNK_SIZE = 1 << 20
+
+def main(path="inputs/day1input.txt"):
+    dial = DialAccumulator()
+    # A path of "-" reads the instructions from standard input
+    if path == "-":
+        for deltas in read_instruction_chunks(sys.stdin.buffer):
+            dial.feed(deltas)
+    else:
+        with open(path, "rb") as file:
+            for deltas in read_instruction_chunks(file):
+                dial.feed(deltas)
+    print(f"Part 1: The number of zeros is: {dial.part1_num_zeros}")
+    print(f"Part 2: The number of zeros is: {dial.part2_num_zeros}")
+
+def rotate_left(num, amount, size=DIAL_SIZE):
+    return rotate(num, -amount, size) if amount > 0 else (num, 0)
+
+def rotate_right(num, amount, size=DIAL_SIZE):
+    return rotate(num, amount, size) if amount > 0 else (num, 0)
+
+def rotate(num, delta, size=DIAL_SIZE):
+    # Rotate the dial by a signed number of clicks (positive is right, negative is left)
+    # Returns the new position and the number of times the dial landed on 0 along the way,
+    # computed arithmetically instead of stepping one click at a time.
+    end = num + delta
+    if delta >= 0:
+        # Multiples of size in the interval (num, end]
+        passed_zeros = end // size - num // size
+    else:
+        # Multiples of size in the interval [end, num)
+        passed_zeros = (num - 1) // size - (end - 1) // size
+    return end % size, passed_zeros
+
+def parse_instruction(line):
+    # Convert an instruction such as "L68" or "R48" into a signed number of clicks
+    direction = line[:1].upper()
+    if isinstance(direction, bytes):
+        direction = direction.decode()
+    amount = int(line[1:].strip())
+    if direction == "R":
+        return amount
+    elif direction == "L":
+        return -amount
+    raise ValueError(f"Invalid direction: {direction}")
+
+def parse_instructions(lines):
+    # Convert a sequence of instruction lines into a NumPy array of signed clicks
+    return np.fromiter((parse_instruction(line) for line in lines if line.strip()), dtype=np.int64)
+
+def rotate_batch(start, deltas, size=DIAL_SIZE):
+    # Apply every signed rotation in deltas, in order, starting from start.
+    # Returns the dial position after each rotation and the number of times the dial
+    # passed 0 during each rotation, both as arrays the same shape as deltas.
+    # start and size may also be arrays, in which case they broadcast against
+    # deltas[:, np.newaxis] so that several dials share one instruction stream.
+    deltas = np.asarray(deltas, dtype=np.int64)
+    # Reduce each step modulo the size first so the cumulative sum cannot overflow
+    positions = np.mod(start + np.cumsum(np.mod(deltas, size), axis=0), size)
+    # Position before each rotation: the start, then every position but the last
+    first = np.broadcast_to(np.mod(start, size), positions.shape[1:])[np.newaxis]
+    previous = np.concatenate((first, positions[:-1]))
+    end = previous + deltas
+    # Same interval counting as rotate(), vectorized over every step
+    right = end // size - previous // size
+    left = (previous - 1) // size - (end - 1) // size
+    passed_zeros = np.where(deltas >= 0, right, left)
+    return positions, passed_zeros
+
+def simulate_batch(deltas, start=50, size=DIAL_SIZE):
+    # Run a whole instruction stream in one vectorized pass
+    # Returns the part 1 count (rotations ending on 0) and the part 2 count (clicks landing on 0)
+    positions, passed_zeros = rotate_batch(start, deltas, size)
+    return int(np.count_nonzero(positions == 0)), int(passed_zeros.sum())
+
+def read_instruction_chunks(stream, chunk_size=CHUNK_SIZE):
+    # Read instructions from a binary file or pipe in fixed-size chunks
+    # Yields one NumPy array of signed clicks per chunk, so memory stays bounded
+    # by the chunk size no matter how large the input is.
+    remainder = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        data = remainder + chunk
+        tokens = data.split()
+        # The last instruction may continue in the next chunk unless the data ends in whitespace
+        if tokens and not data[-1:].isspace():
+            remainder = tokens.pop()
+        else:
+            remainder = b""
+        if tokens:
+            yield parse_instructions(tokens)
+    if remainder:
+        yield parse_instructions([remainder])
+
+class DialAccumulator:
+    # Running state of a dial, so instructions can be fed in any number of chunks
+    def __init__(self, start=50, size=DIAL_SIZE):
+        self.position = start
+        self.size = size
+        self.part1_num_zeros = 0
+        self.part2_num_zeros = 0
+
+    def feed(self, deltas):
+        """Apply a chunk of signed rotations and update the zero counts.
+
+        Args:
+            deltas: A sequence or NumPy array of signed clicks
+
+        Returns:
+            The dial position after the chunk.
+        """
+        positions, passed_zeros = rotate_batch(self.position, deltas, self.size)
+        if len(positions):
+            self.position = int(positions[-1])
+            self.part1_num_zeros += int(np.count_nonzero(positions == 0))
+            self.part2_num_zeros += int(passed_zeros.sum())
+        return self.position
+
+class MultiDialAccumulator:
+    # Running state of many dials that all follow the same instruction stream
+    # Each dial has its own size and start position; state is kept in NumPy arrays
+    # so every instruction is applied to all dials at once.
+    def __init__(self, starts, sizes=DIAL_SIZE, block_cells=1 << 22):
+        sizes = np.asarray(sizes, dtype=np.int64)
+        if np.any(sizes <= 0):
+            raise ValueError("Dial sizes must be positive")
+        starts = np.asarray(starts, dtype=np.int64)
+        starts, sizes = np.broadcast_arrays(starts, sizes)
+        self.sizes = sizes.copy()
+        self.positions = np.mod(starts, self.sizes)
+        self.part1_num_zeros = np.zeros(len(self.sizes), dtype=np.int64)
+        self.part2_num_zeros = np.zeros(len(self.sizes), dtype=np.int64)
+        # Limit the number of instructions expanded against all dials at once
+        self.block_size = max(1, block_cells // max(1, len(self.sizes)))
+
+    def feed(self, deltas):
+        """Apply a chunk of signed rotations to every dial and update the zero counts.
+
+        Args:
+            deltas: A sequence or NumPy array of signed clicks
+
+        Returns:
+            The array of dial positions after the chunk.
+        """
+        deltas = np.asarray(deltas, dtype=np.int64)
+        for block_start in range(0, len(deltas), self.block_size):
+            block = deltas[block_start:block_start + self.block_size, np.newaxis]
+            positions, passed_zeros = rotate_batch(self.positions, block, self.sizes)
+            self.positions = positions[-1]
+            self.part1_num_zeros += np.count_nonzero(positions == 0, axis=0)
+            self.part2_num_zeros += passed_zeros.sum(axis=0)
+        return self.positions
+
+def simulate_dials(deltas, starts, sizes=DIAL_SIZE):
+    # Run one instruction stream over several dials at once
+    # Returns arrays with the part 1 and part 2 zero counts for each dial
+    dials = MultiDialAccumulator(starts, sizes)
+    dials.feed(deltas)
+    return dials.part1_num_zeros, dials.part2_num_zeros
+
+def simulate_loop(deltas, start=50, size=DIAL_SIZE):
+    # Apply the instructions one at a time, the same way main does
+    curr_num = start
     part1_num_zeros = 0
     part2_num_zeros = 0
-    
-    with open("inputs/day1input.txt", "r") as file:
-        for line in file:
-            # Process the change in the dial
-            # Get the direction from the first character
-            direction = line[0].upper()
-            # Get the amount from the rest of the line
-            amount = int(line[1:].strip())
-            # Process the change in the dial
-            if direction == "R":
-                # If R, we want to rotate right by the amount, wrapping at 99 and 0
-                # We can use modulo arithmetic to wrap around
-                curr_num, passed_zeros = rotate_right(curr_num, amount)
-                part2_num_zeros += passed_zeros
-            elif direction == "L":
-                # If L, we want to rotate left by the amount, wrapping at 99 and 0
-                # We can use modulo arithmetic to wrap around
-                curr_num, passed_zeros = rotate_left(curr_num, amount)
-                part2_num_zeros += passed_zeros
-            else:
-                raise ValueError(f"Invalid direction: {direction}")
-            # If the number is 0, we have a zero
-            if curr_num == 0:
-                part1_num_zeros += 1
-    print(f"Part 1: The number of zeros is: {part1_num_zeros}")
-    print(f"Part 2: The number of zeros is: {part2_num_zeros}")
-
-def rotate_left(num, amount):
-    passed_zeros = 0
-    for i in range(amount):
-        num = (num - 1) % 100
-        if num == 0:
-            passed_zeros += 1
-    return num, passed_zeros
-
-def rotate_right(num, amount):
-    passed_zeros = 0
-    for i in range(amount):
-        num = (num + 1) % 100
-        if num == 0:
-            passed_zeros += 1
-    return num, passed_zeros
+    for delta in deltas:
+        curr_num, passed_zeros = rotate(curr_num, int(delta), size)
+        part2_num_zeros += passed_zeros
+        if curr_num == 0:
+            part1_num_zeros += 1
+    return part1_num_zeros, part2_num_zeros
+
+def benchmark_batch(num_instructions=10**7, max_amount=1000, seed=0):
+    # Compare the line-by-line loop against the vectorized batch on generated instructions
+    rng = np.random.default_rng(seed)
+    deltas = rng.integers(-max_amount, max_amount + 1, size=num_instructions, dtype=np.int64)
+
+    start_time = time.perf_counter()
+    loop_result = simulate_loop(deltas.tolist())
+    loop_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    batch_result = simulate_batch(deltas)
+    batch_time = time.perf_counter() - start_time
+
+    if loop_result != batch_result:
+        raise AssertionError(f"Batch result {batch_result} does not match loop result {loop_result}")
+    print(f"{num_instructions} instructions")
+    print(f"Loop:  {loop_time:.3f}s")
+    print(f"Batch: {batch_time:.3f}s ({loop_time / batch_time:.1f}x faster)")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_batch()
+    elif len(sys.argv) > 1:
+        main(sys.argv[1])
+    else:
+        main()
\ No newline at end of file
@@ -1,23 +1,63 @@
-def main():
-    invalid_ids = []
+import heapq
+import os
+import sys
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# Powers of ten used to count the digits of an id without converting it to a string
+POWERS_OF_TEN = [10 ** exponent for exponent in range(40)]
+
+# Number of shards handed to each worker by default, so uneven shards even out
+SHARDS_PER_WORKER = 4
+
+def main(workers=None, shard_size=None):
+    ranges = []
     with open("inputs/day2input.txt", "r") as file:
         for line in file:
-            # split the line into N ranges, separated by commas
-            ranges = line.split(",")
-            for group in ranges:
-                # split the range into a start and end, separated by a hyphen
-                start, end = group.split("-")
-                # convert the start and end to integers
-                start = int(start)
-                end = int(end)
-                # Check for validity of each id in the range
-                for id in range(start, end + 1):
-                    # Check if the id is valid
-                    if not is_valid_complete(id):
-                        # If the id is not valid, add it to the list of invalid ids
-                        invalid_ids.append(id)
-    # Print the sum of invalid ids
-    print(sum(invalid_ids))
+            ranges.extend(parse_ranges(line))
+    # Merge overlapping ranges so that no id is counted twice,
+    # then add up the invalid ids in each merged range
+    if workers is None:
+        print(sum_invalid_ids_in_ranges(ranges))
+    else:
+        print(sum_invalid_ids_parallel(ranges, workers, shard_size))
+
+def parse_ranges(line):
+    # split the line into N ranges, separated by commas
+    ranges = []
+    for group in line.split(","):
+        if not group.strip():
+            continue
+        # split the range into a start and end, separated by a hyphen
+        start, end = group.split("-")
+        # convert the start and end to integers
+        ranges.append((int(start), int(end)))
+    return ranges
+
+def merge_ranges(ranges):
+    # Merge overlapping or adjacent (start, end) ranges into a sorted list of disjoint ranges
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def iter_invalid_ids_in_ranges(ranges):
+    # Yield the invalid ids covered by any of the ranges, each once and in increasing order
+    for start, end in merge_ranges(ranges):
+        yield from generate_invalid_ids(start, end)
+
+def sum_invalid_ids_in_ranges(ranges):
+    # Sum the invalid ids covered by any of the ranges, counting overlaps once
+    # Memory stays proportional to the number of ranges, not their width
+    total = 0
+    for start, end in merge_ranges(ranges):
+        total += sum_invalid_ids(start, end)
+    return total
 
 def is_valid_basic(id):
     # Check if the id is valid
@@ -61,5 +101,160 @@ def is_valid_complete(id):
     # No repeating pattern found, so the id is valid
     return True
 
+# Invalid ids are built directly rather than searched for.
+# An id with L digits made of a block of p digits repeated L / p times is
+# block * multiplier, where the multiplier is 1 followed by p - 1 zeros, repeated,
+# e.g. 1001 for p = 3, L = 6 or 10101 for p = 2, L = 6.
+
+@lru_cache(maxsize=None)
+def repeat_multiplier(length, period):
+    # Multiplier that repeats a block of period digits to fill length digits
+    return (10 ** length - 1) // (10 ** period - 1)
+
+def repeat_periods(length):
+    # Block sizes that can repeat at least twice to fill length digits
+    return [period for period in range(1, length // 2 + 1) if length % period == 0]
+
+@lru_cache(maxsize=None)
+def repeat_multipliers(length):
+    # Multipliers to test an id of length digits against, cached per length
+    # Only periods where length / period is prime are needed: an id that repeats a
+    # shorter block also repeats every longer block made of whole copies of it.
+    multipliers = []
+    for period in repeat_periods(length):
+        repetitions = length // period
+        if all(repetitions % factor != 0 for factor in range(2, int(repetitions ** 0.5) + 1)):
+            multipliers.append(repeat_multiplier(length, period))
+    return tuple(multipliers)
+
+def digit_count(id):
+    # Number of decimal digits in a non-negative id
+    if id < POWERS_OF_TEN[-1]:
+        # Searching from index 1 counts 0 as one digit
+        return bisect_right(POWERS_OF_TEN, id, 1)
+    return len(str(id))
+
+def is_valid_basic_numeric(id):
+    # Same as is_valid_basic, using arithmetic instead of strings
+    # An id with an even number of digits is two equal halves when it is divisible by 10^(L/2) + 1
+    # The digit_count lookup is inlined to save a function call per id
+    length = bisect_right(POWERS_OF_TEN, id, 1) if id < POWERS_OF_TEN[-1] else digit_count(id)
+    if length % 2 == 1:
+        return True
+    return id % (10 ** (length // 2) + 1) != 0
+
+def is_valid_complete_numeric(id):
+    # Same as is_valid_complete, using arithmetic instead of strings
+    # An id of L digits repeats a block of p digits exactly when it is divisible by the
+    # multiplier for L and p, since the quotient is then the block itself.
+    length = bisect_right(POWERS_OF_TEN, id, 1) if id < POWERS_OF_TEN[-1] else digit_count(id)
+    for multiplier in repeat_multipliers(length):
+        if id % multiplier == 0:
+            return False
+    return True
+
+def block_range(length, period, start, end):
+    # First and last block of period digits whose repetition to length digits lies in [start, end]
+    multiplier = repeat_multiplier(length, period)
+    first = max(10 ** (period - 1), -(-start // multiplier))
+    last = min(10 ** period - 1, end // multiplier)
+    return first, last
+
+def digit_lengths(start, end):
+    # Yield each digit length in [start, end] with the part of the range that has that length
+    start = max(start, 1)
+    for length in range(len(str(start)), len(str(end)) + 1):
+        low = max(start, 10 ** (length - 1))
+        high = min(end, 10 ** length - 1)
+        if low <= high:
+            yield length, low, high
+
+def generate_invalid_ids(start, end):
+    # Yield every invalid id in [start, end] in increasing order
+    # The cost depends on the number of invalid ids, not on the width of the range
+    for length, low, high in digit_lengths(start, end):
+        generators = [ids_with_period(length, period, low, high) for period in repeat_periods(length)]
+        yield from heapq.merge(*generators)
+
+def ids_with_period(length, period, start, end):
+    # Yield the ids in [start, end] whose shortest repeating block has period digits
+    multiplier = repeat_multiplier(length, period)
+    first, last = block_range(length, period, start, end)
+    for block in range(first, last + 1):
+        # Skip blocks that repeat themselves, those ids come from a shorter period
+        if is_valid_complete_numeric(block):
+            yield block * multiplier
+
+def sum_invalid_ids(start, end):
+    # Sum the invalid ids in [start, end] without listing them
+    # For each period, the ids with that period are an arithmetic series of blocks
+    # times the multiplier. Ids whose shortest period is smaller also appear in that
+    # series, so they are subtracted using the sums already found for the divisors.
+    total = 0
+    for length, low, high in digit_lengths(start, end):
+        exact_sums = {}
+        for period in repeat_periods(length):
+            first, last = block_range(length, period, low, high)
+            periodic_sum = 0
+            if first <= last:
+                periodic_sum = repeat_multiplier(length, period) * (first + last) * (last - first + 1) // 2
+            shorter = sum(exact_sums[divisor] for divisor in exact_sums if period % divisor == 0)
+            exact_sums[period] = periodic_sum - shorter
+        total += sum(exact_sums.values())
+    return total
+
+def shard_ranges(ranges, shard_size):
+    # Merge the ranges and cut them into shards of at most shard_size ids each
+    if shard_size < 1:
+        raise ValueError(f"Invalid shard size: {shard_size}")
+    shards = []
+    for start, end in merge_ranges(ranges):
+        while start <= end:
+            shard_end = min(end, start + shard_size - 1)
+            shards.append((start, shard_end))
+            start = shard_end + 1
+    return shards
+
+def sum_invalid_ids_in_shard(shard):
+    # Worker task: sum the invalid ids of one (start, end) shard
+    start, end = shard
+    return sum_invalid_ids(start, end)
+
+def sum_invalid_ids_parallel(ranges, workers=None, shard_size=None):
+    # Same result as sum_invalid_ids_in_ranges, with the shards spread over a process pool
+    # By default the merged ranges are cut into SHARDS_PER_WORKER equally wide shards per worker.
+    workers = workers or os.cpu_count() or 1
+    if shard_size is None:
+        width = sum(end - start + 1 for start, end in merge_ranges(ranges))
+        shard_size = max(1, -(-width // (workers * SHARDS_PER_WORKER)))
+    shards = shard_ranges(ranges, shard_size)
+    if not shards:
+        return 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map returns the results in shard order, so the total is built the same way every run
+        total = 0
+        for shard_sum in executor.map(sum_invalid_ids_in_shard, shards):
+            total += shard_sum
+    return total
+
+def benchmark_validity_checks(count=10**6, start=10**9):
+    # Compare the string based checks against the numeric checks on count consecutive ids
+    ids = range(start, start + count)
+    checks = [
+        ("is_valid_basic", is_valid_basic),
+        ("is_valid_basic_numeric", is_valid_basic_numeric),
+        ("is_valid_complete", is_valid_complete),
+        ("is_valid_complete_numeric", is_valid_complete_numeric),
+    ]
+    print(f"{count} ids starting at {start}")
+    for name, check in checks:
+        start_time = time.perf_counter()
+        invalid = sum(1 for id in ids if not check(id))
+        elapsed = time.perf_counter() - start_time
+        print(f"{name}: {elapsed:.3f}s ({invalid} invalid)")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_validity_checks()
+    else:
+        main()
\ No newline at end of file
@@ -4,15 +4,24 @@
 # Part 2: Find the largest 12-digit number that can be formed from the line,
 # where each digit must come from a later position than the previous digit.
 
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Number of digits processed at once by the vectorized batch scorer
+BLOCK_CELLS = 1 << 22
+
+# Number of lines sent to a worker at a time by the parallel scorer
+BATCH_SIZE = 10000
+
 def main():
-    part_one_sum = 0
-    part_two_sum = 0
-    with open("inputs/day3input.txt", "r") as file:
-        for line in file:
-            # Because Advent has a second part, we'll do processing for each
-            # part in a separate function.
-            part_one_sum += part_one(line)
-            part_two_sum += find_battery_output(line, 12)
+    # Part one uses 2 digits per bank and part two uses 12,
+    # both scored in a single batch pass over the file
+    part_one_sum, part_two_sum = score_banks("inputs/day3input.txt", (2, 12))
     print(f"Part 1: The sum of the largest two-digit numbers is: {part_one_sum}")
     print(f"Part 2: The sum of the largest 12-digit numbers is: {part_two_sum}")
 
@@ -25,41 +34,215 @@ def find_battery_output(line, num_digits):
     # where each digit must come from a later position than the previous digit.
     
     # strip the line, so that we don't have to deal with whitespace
-    line = line.strip()
+    # and work on the bytes, where comparing '0'..'9' compares the digits
+    return largest_subsequence(line.strip().encode(), num_digits)
+
+def largest_subsequence(digits, num_digits):
+    # Find the largest num_digits-digit subsequence of a bytes string of digits
+    # in a single pass, using a monotonic stack.
     
     # If the line doesn't have enough digits, return 0
-    if len(line) < num_digits:
+    if len(digits) < num_digits or num_digits <= 0:
         return 0
     
-    # Store the indices of the selected digits
-    digit_indices = []
-    
-    # For each digit position, find the largest available digit
-    # The first digit can be from position 0 to len(line) - num_digits
-    # The second digit can be from position (first_index + 1) to len(line) - (num_digits - 1)
-    # And so on...
+    # We may drop this many digits in total. While the top of the stack is
+    # smaller than the incoming digit and we can still drop digits, a larger
+    # number is made by dropping the top and using the incoming digit instead.
+    drops_left = len(digits) - num_digits
+    stack = bytearray()
+    for digit in digits:
+        while drops_left and stack and stack[-1] < digit:
+            stack.pop()
+            drops_left -= 1
+        stack.append(digit)
     
-    start_index = 0
-    for digit_pos in range(num_digits):
-        # Calculate the maximum index we can search for this digit
-        # We need to leave enough digits for the remaining positions
-        max_index = len(line) - (num_digits - digit_pos)
-        
-        # Find the largest digit in the available range
-        current_largest_index = start_index
-        for i in range(start_index, max_index + 1):
-            if int(line[i]) > int(line[current_largest_index]):
-                current_largest_index = i
-        
-        digit_indices.append(current_largest_index)
-        start_index = current_largest_index + 1
-    
-    # Build the N-digit number
-    result = 0
-    for i, index in enumerate(digit_indices):
-        result = result * 10 + int(line[index])
-    
-    return result
+    # Any drops we didn't use come off the end, which keeps the largest prefix
+    return int(stack[:num_digits])
+
+class BatteryIndex:
+    # Range-maximum index over one bank line, built once and then used to answer
+    # find_battery_output for any number of digits.
+    # levels[j][i] is the index of the largest digit in line[i:i + 2**j], taking the
+    # first one when several are equally large.
+    def __init__(self, line):
+        self.digits = line.strip().encode()
+        self.levels = [list(range(len(self.digits)))]
+        width = 1
+        while width * 2 <= len(self.digits):
+            previous = self.levels[-1]
+            level = []
+            for i in range(len(self.digits) - width * 2 + 1):
+                left = previous[i]
+                right = previous[i + width]
+                level.append(right if self.digits[right] > self.digits[left] else left)
+            self.levels.append(level)
+            width *= 2
+
+    def max_index(self, start, end):
+        """Return the index of the first largest digit in line[start:end + 1].
+
+        Args:
+            start: The first index of the range
+            end: The last index of the range (inclusive)
+
+        Returns:
+            The index of the largest digit, the earliest one on ties.
+        """
+        level = (end - start + 1).bit_length() - 1
+        left = self.levels[level][start]
+        right = self.levels[level][end - (1 << level) + 1]
+        return right if self.digits[right] > self.digits[left] else left
+
+    def query(self, num_digits):
+        """Return the same value as find_battery_output(line, num_digits).
+
+        Each digit costs one range-maximum lookup.
+        """
+        if len(self.digits) < num_digits or num_digits <= 0:
+            return 0
+        result = 0
+        start_index = 0
+        for digit_pos in range(num_digits):
+            # Leave enough digits for the remaining positions
+            max_index = len(self.digits) - (num_digits - digit_pos)
+            index = self.max_index(start_index, max_index)
+            result = result * 10 + self.digits[index] - 48
+            start_index = index + 1
+        return result
+
+    def query_many(self, digit_counts):
+        """Return the battery output for each number of digits in digit_counts."""
+        return [self.query(num_digits) for num_digits in digit_counts]
+
+def score_banks(path, digit_counts):
+    # Memory-map the file and sum find_battery_output over every bank for each
+    # number of digits in digit_counts.
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return [0] * len(digit_counts)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            data = np.frombuffer(buffer, dtype=np.uint8)
+            sums = score_bank_bytes(data, digit_counts)
+            # Release the view before the map is closed
+            del data
+    return sums
+
+def score_bank_bytes(data, digit_counts):
+    # Sum find_battery_output over every line in a uint8 array of file bytes.
+    # When every line has the same length, the lines are viewed as the rows of a
+    # matrix without copying and scored with vectorized argmax; otherwise each
+    # line is scored on its own.
+    newlines = np.flatnonzero(data == ord("\n"))
+    ends = newlines
+    if len(data) and data[-1] != ord("\n"):
+        # The last line has no newline after it
+        ends = np.append(newlines, len(data))
+    starts = np.concatenate(([0], newlines + 1))[:len(ends)]
+    lengths = ends - starts
+    if len(lengths) and np.all(lengths == lengths[0]) and lengths[0] > 0:
+        width = int(lengths[0])
+        # Row i starts at byte i * (width + 1), just past the previous newline
+        rows = np.lib.stride_tricks.as_strided(data, shape=(len(lengths), width), strides=(width + 1, 1))
+        if rows[:, -1].min() == ord("\r") and rows[:, -1].max() == ord("\r"):
+            # Windows line endings
+            rows = rows[:, :-1]
+        if rows.shape[1] == 0:
+            # Every line was empty
+            return [0] * len(digit_counts)
+        sums = score_digit_rows(rows, digit_counts)
+        if sums is not None:
+            return sums
+    # Ragged lines: fall back to one line at a time
+    sums = [0] * len(digit_counts)
+    for start, end in zip(starts, ends):
+        digits = data[start:end].tobytes().strip()
+        for i, num_digits in enumerate(digit_counts):
+            sums[i] += largest_subsequence(digits, num_digits)
+    return sums
+
+def score_digit_rows(rows, digit_counts):
+    # Sum the largest subsequences of a 2D uint8 array of ASCII digit rows.
+    # Returns None if any byte is not a digit, so the caller can fall back.
+    sums = [0] * len(digit_counts)
+    width = rows.shape[1]
+    block_rows = max(1, BLOCK_CELLS // max(1, width))
+    columns = np.arange(width)
+    for block_start in range(0, len(rows), block_rows):
+        # uint8 arithmetic wraps, so anything below '0' also ends up above 9
+        digits = rows[block_start:block_start + block_rows] - ord("0")
+        if digits.max() > 9:
+            return None
+        row_numbers = np.arange(len(digits))
+        # Shift digits up by one so that 0 can mark positions outside the window
+        shifted = digits + 1
+        for i, num_digits in enumerate(digit_counts):
+            if num_digits <= 0 or num_digits > width:
+                continue
+            start_index = np.zeros(len(digits), dtype=np.intp)
+            for digit_pos in range(num_digits):
+                # The window for this digit runs from start_index to max_index in each row
+                max_index = width - (num_digits - digit_pos)
+                window = shifted[:, :max_index + 1]
+                in_window = columns[:max_index + 1] >= start_index[:, np.newaxis]
+                # argmax returns the first largest digit, like find_battery_output
+                chosen = np.where(in_window, window, 0).argmax(axis=1)
+                digit_sum = int(digits[row_numbers, chosen].sum(dtype=np.int64))
+                sums[i] += digit_sum * 10 ** (num_digits - 1 - digit_pos)
+                start_index = chosen + 1
+    return sums
+
+def score_lines(lines, digit_counts):
+    # Worker task: sum the battery outputs of a batch of lines for each number of digits
+    sums = [0] * len(digit_counts)
+    for line in lines:
+        digits = line.strip()
+        for i, num_digits in enumerate(digit_counts):
+            sums[i] += largest_subsequence(digits, num_digits)
+    return sums
+
+def read_line_batches(file, batch_size):
+    # Yield lists of up to batch_size lines from an open file
+    batch = []
+    for line in file:
+        batch.append(line)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def score_banks_parallel(path, digit_counts, workers=None, batch_size=BATCH_SIZE, max_pending=None):
+    # Sum find_battery_output over every bank in the file for each number of digits
+    # in digit_counts, with batches of lines scored on a process pool.
+    # At most max_pending batches are in flight at once; reading waits for the
+    # oldest batch to finish, so memory stays bounded for huge files.
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    sums = [0] * len(digit_counts)
+    line_count = 0
+    start_time = time.perf_counter()
+
+    def collect(pending):
+        # Add the results of the oldest batch, keeping the batches in file order
+        nonlocal line_count
+        num_lines, future = pending.popleft()
+        for i, batch_sum in enumerate(future.result()):
+            sums[i] += batch_sum
+        line_count += num_lines
+
+    with open(path, "rb") as file, ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in read_line_batches(file, batch_size):
+            if len(pending) >= max_pending:
+                collect(pending)
+            pending.append((len(batch), executor.submit(score_lines, batch, digit_counts)))
+        while pending:
+            collect(pending)
+
+    elapsed = time.perf_counter() - start_time
+    rate = line_count / elapsed if elapsed > 0 else 0
+    print(f"Scored {line_count} lines in {elapsed:.3f}s ({rate:.0f} lines per second)")
+    return sums
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
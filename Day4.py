@@ -1,3 +1,13 @@
+import mmap
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
 def main():
     with open("inputs/day4input.txt", "r") as file:
         grid = build_grid(file)
@@ -49,32 +59,394 @@ def get_total_count_below_limit(grid, limit):
 # Returns the total count of removed objects
 def remove_objects_iteratively(grid, limit):
     total_removed = 0
-    
-    while True:
-        # Find all objects that can be removed in this iteration
-        to_remove = []
-        for y in range(len(grid)):
-            for x in range(len(grid[y])):
-                # Only consider '@' objects (not already removed 'X')
-                if grid[y][x] != '@':
-                    continue
-                # Check if this object has <= limit surrounding objects
-                if count_surrounding_objects(grid, x, y) <= limit:
-                    to_remove.append((x, y))
-        
-        # If no objects to remove, we're done
-        if len(to_remove) == 0:
-            break
-        
-        # Remove all objects found in this iteration
+    for removed in iter_removal_rounds(grid, limit):
+        total_removed += len(removed)
+    return total_removed
+
+# Yield the (x, y) positions removed in each round of remove_objects_iteratively
+# Every object with <= limit surrounding objects is removed in the same round,
+# as if the whole grid were rescanned, but the counts are only computed once.
+# Removing an object lowers the count of each of its neighbors by one, and only
+# neighbors whose count drops to the limit need checking in the next round.
+def iter_removal_rounds(grid, limit):
+    # Count the surrounding objects of every object once
+    counts = []
+    for y in range(len(grid)):
+        row = []
+        for x in range(len(grid[y])):
+            row.append(count_surrounding_objects(grid, x, y) if grid[y][x] == '@' else 0)
+        counts.append(row)
+
+    # The first round is every object already at or below the limit
+    to_remove = []
+    for y in range(len(grid)):
+        for x in range(len(grid[y])):
+            if grid[y][x] == '@' and counts[y][x] <= limit:
+                to_remove.append((x, y))
+
+    while len(to_remove) > 0:
+        # Remove all objects found in this round
         for x, y in to_remove:
             grid[y][x] = 'X'
-            total_removed += 1
-        
-        # After removing objects, surrounding counts change for neighbors
-        # So we'll recalculate in the next iteration
-    
+        yield to_remove
+
+        # Update the neighbors of the removed objects
+        # Objects left in the grid all had more than limit surrounding objects,
+        # so each one reaches the limit at most once and is queued at most once
+        next_round = []
+        for x, y in to_remove:
+            for row in range(y-1, y+2):
+                for col in range(x-1, x+2):
+                    if row == y and col == x:
+                        continue
+                    if row >= 0 and row < len(grid) and col >= 0 and col < len(grid[0]):
+                        if grid[row][col] == '@':
+                            counts[row][col] -= 1
+                            if counts[row][col] == limit:
+                                next_round.append((col, row))
+        to_remove = next_round
+
+# Build a boolean array from the input file, True where there is an object
+def build_grid_array(file):
+    return grid_to_array(build_grid(file))
+
+# Convert a list-of-lists grid into a boolean array, True where there is an object
+def grid_to_array(grid):
+    width = len(grid[0]) if grid else 0
+    return np.array([[char == '@' for char in row] for row in grid], dtype=bool).reshape(len(grid), width)
+
+# Count the surrounding objects of every position at once
+# The grid is padded with an empty border, and each of the 8 neighbor
+# directions is added as a shifted slice of the padded grid
+def count_neighbors_array(occupied):
+    height, width = occupied.shape
+    padded = np.pad(occupied.astype(np.uint8), 1)
+    counts = np.zeros((height, width), dtype=np.uint8)
+    for dy in range(3):
+        for dx in range(3):
+            if dy == 1 and dx == 1:
+                continue
+            counts += padded[dy:dy + height, dx:dx + width]
+    return counts
+
+# Same as get_total_count_below_limit, for a boolean array grid
+def get_total_count_below_limit_array(occupied, limit):
+    return int(np.count_nonzero(occupied & (count_neighbors_array(occupied) <= limit)))
+
+# Same as remove_objects_iteratively, for a boolean array grid
+# Each round removes every object at or below the limit with one mask update,
+# then subtracts the removed objects from their neighbors' counts
+# Removed objects are set to False in place
+def remove_objects_iteratively_array(occupied, limit):
+    total_removed = 0
+    counts = count_neighbors_array(occupied)
+    while True:
+        to_remove = occupied & (counts <= limit)
+        removed = int(np.count_nonzero(to_remove))
+        if removed == 0:
+            break
+        occupied &= ~to_remove
+        counts -= count_neighbors_array(to_remove)
+        total_removed += removed
     return total_removed
 
+# Byte table used when packing a row of the grid: '@' becomes 1, anything else 0
+BIT_TABLE = bytes(ord('1') if byte == ord('@') else ord('0') for byte in range(256))
+
+# Pack one row of the grid into an int, with bit x set when column x has an object
+def pack_row(line):
+    line = line.strip()
+    if not line:
+        return 0
+    # Non-ASCII characters become a single '?' byte, so columns stay aligned
+    bits = line.encode('ascii', 'replace').translate(BIT_TABLE)
+    # int() reads the most significant bit first, so the row is reversed
+    return int(bits[::-1], 2)
+
+# Return the bits of row for objects with <= limit surrounding objects
+# above and below are the packed rows around it (0 at the edges of the grid)
+# The 8 neighbor directions are shifted copies of the three rows; they are added
+# into a 4-bit counter held as four bit planes, so every column is counted at once
+def below_limit_bits(above, row, below, mask, limit):
+    if limit < 0:
+        return 0
+    if limit >= 8:
+        return row
+    neighbors = (
+        (above << 1) & mask, above, above >> 1,
+        (row << 1) & mask, row >> 1,
+        (below << 1) & mask, below, below >> 1,
+    )
+    bit0 = bit1 = bit2 = bit3 = 0
+    for plane in neighbors:
+        # Ripple-carry add a one-bit plane into the counter
+        carry = plane
+        bit0, carry = bit0 ^ carry, bit0 & carry
+        bit1, carry = bit1 ^ carry, bit1 & carry
+        bit2, carry = bit2 ^ carry, bit2 & carry
+        bit3 ^= carry
+    # Columns whose count equals one of 0..limit
+    at_or_below = 0
+    for value in range(limit + 1):
+        matches = mask
+        for position, plane in enumerate((bit0, bit1, bit2, bit3)):
+            matches &= plane if value >> position & 1 else ~plane
+        at_or_below |= matches
+    return row & at_or_below
+
+# Grid of objects stored as one bit per cell
+# Each row is a Python int with bit x set when column x holds an object
+class BitGrid:
+    def __init__(self, rows, width):
+        self.rows = rows
+        self.width = width
+        self.mask = (1 << width) - 1
+
+    @classmethod
+    def from_file(cls, file):
+        """Build a BitGrid from an open input file, one row per line."""
+        rows = []
+        width = 0
+        for line in file:
+            line = line.strip()
+            width = max(width, len(line))
+            rows.append(pack_row(line))
+        return cls(rows, width)
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Build a BitGrid from a list-of-lists grid."""
+        width = len(grid[0]) if grid else 0
+        return cls([pack_row(''.join(row)) for row in grid], width)
+
+    def count(self):
+        """Return the number of objects in the grid."""
+        return sum(row.bit_count() for row in self.rows)
+
+    def removable_row(self, y, limit):
+        """Return the bits of row y for objects with <= limit surrounding objects."""
+        above = self.rows[y - 1] if y > 0 else 0
+        below = self.rows[y + 1] if y + 1 < len(self.rows) else 0
+        return below_limit_bits(above, self.rows[y], below, self.mask, limit)
+
+    def count_below_limit(self, limit):
+        """Same as get_total_count_below_limit."""
+        return sum(self.removable_row(y, limit).bit_count() for y in range(len(self.rows)))
+
+    def remove_iteratively(self, limit):
+        """Same as remove_objects_iteratively, clearing the removed bits in place.
+
+        Only rows next to a row that changed in the previous round are checked again.
+        """
+        total_removed = 0
+        to_check = range(len(self.rows))
+        while True:
+            # Find every removal in this round before changing any row
+            removals = []
+            for y in to_check:
+                removable = self.removable_row(y, limit)
+                if removable:
+                    removals.append((y, removable))
+            if not removals:
+                break
+            changed = set()
+            for y, removable in removals:
+                self.rows[y] &= ~removable
+                total_removed += removable.bit_count()
+                changed.update((y - 1, y, y + 1))
+            to_check = sorted(y for y in changed if 0 <= y < len(self.rows))
+        return total_removed
+
+# Same as get_total_count_below_limit, reading the grid from an open file one row at a time
+# Only three packed rows are held in memory at once
+def count_below_limit_streaming(file, limit):
+    count = 0
+    above = 0
+    row = None
+    mask = None
+    for line in file:
+        below = pack_row(line)
+        if mask is None:
+            mask = (1 << len(line.strip())) - 1
+        if row is not None:
+            count += below_limit_bits(above, row, below, mask, limit).bit_count()
+            above = row
+        row = below
+    # The last row has nothing below it
+    if row is not None:
+        count += below_limit_bits(above, row, 0, mask, limit).bit_count()
+    return count
+
+# Header of a packed grid file: the height and width of the grid
+PACKED_HEADER = struct.Struct('<QQ')
+
+# Write the grid from an open input file to a packed grid file at path
+# Each row is stored as (width + 7) // 8 little-endian bytes, bit x for column x,
+# after a header with the height and width
+def pack_grid_file(file, path):
+    height = 0
+    width = None
+    with open(path, 'wb') as packed:
+        packed.write(PACKED_HEADER.pack(0, 0))
+        for line in file:
+            if width is None:
+                width = len(line.strip())
+            packed.write(pack_row(line).to_bytes((width + 7) // 8, 'little'))
+            height += 1
+        packed.seek(0)
+        packed.write(PACKED_HEADER.pack(height, width or 0))
+
+# Same as remove_objects_iteratively, on a packed grid file that is memory-mapped
+# instead of loaded, so the grid can be larger than memory
+# Each round streams through the rows keeping only the rows next to the current one;
+# the previous row is kept as it was before this round so removals stay synchronous
+# Removed objects are cleared in the file
+def remove_objects_out_of_core(path, limit):
+    total_removed = 0
+    with open(path, 'r+b') as packed, mmap.mmap(packed.fileno(), 0) as grid:
+        height, width = PACKED_HEADER.unpack_from(grid)
+        mask = (1 << width) - 1
+        row_bytes = (width + 7) // 8
+
+        def read_row(y):
+            offset = PACKED_HEADER.size + y * row_bytes
+            return int.from_bytes(grid[offset:offset + row_bytes], 'little')
+
+        def write_row(y, row):
+            offset = PACKED_HEADER.size + y * row_bytes
+            grid[offset:offset + row_bytes] = row.to_bytes(row_bytes, 'little')
+
+        while True:
+            removed = 0
+            above = 0
+            row = read_row(0) if height > 0 else 0
+            for y in range(height):
+                below = read_row(y + 1) if y + 1 < height else 0
+                to_remove = below_limit_bits(above, row, below, mask, limit)
+                if to_remove:
+                    write_row(y, row & ~to_remove)
+                    removed += to_remove.bit_count()
+                above = row
+                row = below
+            if removed == 0:
+                break
+            total_removed += removed
+        grid.flush()
+    return total_removed
+
+# Arrays of the tiled engine, attached once in each worker process
+TILE_STATE = {}
+
+# Worker initializer: attach the two shared grid buffers of the tiled engine
+def attach_tile_buffers(names, shape):
+    TILE_STATE['memory'] = [shared_memory.SharedMemory(name=name) for name in names]
+    TILE_STATE['buffers'] = [np.ndarray(shape, dtype=bool, buffer=memory.buf) for memory in TILE_STATE['memory']]
+
+# Worker task: run one removal round on rows start to end - 1
+# Reads the grid from one shared buffer and writes the band's new rows to the other,
+# so no band sees another band's removals until the next round
+# The band is read with one row of halo above and below for the neighbor counts
+def remove_band_round(start, end, limit, source_index):
+    source = TILE_STATE['buffers'][source_index]
+    destination = TILE_STATE['buffers'][1 - source_index]
+    top = max(0, start - 1)
+    bottom = min(source.shape[0], end + 1)
+    window = source[top:bottom]
+    counts = count_neighbors_array(window)
+    band = window[start - top:end - top]
+    to_remove = band & (counts[start - top:end - top] <= limit)
+    destination[start:end] = band & ~to_remove
+    return int(np.count_nonzero(to_remove))
+
+# Same as remove_objects_iteratively_array, with the grid split into row bands
+# that are processed on a pool of worker processes
+# The grid lives in two shared memory buffers; each round reads one and writes
+# the other, and all bands finish a round before the next one starts
+# Removed objects are set to False in place
+# Returns the total count of removed objects and the time taken by each round
+def remove_objects_tiled(occupied, limit, workers=None, bands=None):
+    workers = workers or os.cpu_count() or 1
+    bands = bands or workers
+    height = occupied.shape[0]
+    band_height = max(1, -(-height // bands))
+    band_bounds = [(start, min(height, start + band_height)) for start in range(0, height, band_height)]
+
+    memory = [shared_memory.SharedMemory(create=True, size=max(1, occupied.nbytes)) for _ in range(2)]
+    try:
+        buffers = [np.ndarray(occupied.shape, dtype=bool, buffer=block.buf) for block in memory]
+        buffers[0][:] = occupied
+        total_removed = 0
+        round_times = []
+        source_index = 0
+        names = [block.name for block in memory]
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach_tile_buffers,
+                                 initargs=(names, occupied.shape)) as executor:
+            while True:
+                start_time = time.perf_counter()
+                futures = [executor.submit(remove_band_round, start, end, limit, source_index)
+                           for start, end in band_bounds]
+                # Waiting on every band is the barrier between rounds
+                removed = sum(future.result() for future in futures)
+                round_times.append(time.perf_counter() - start_time)
+                source_index = 1 - source_index
+                if removed == 0:
+                    break
+                total_removed += removed
+        occupied[:] = buffers[source_index]
+        del buffers
+    finally:
+        for block in memory:
+            block.close()
+            block.unlink()
+    return total_removed, round_times
+
+# Compare the tiled engine against the single process array engine on a random grid
+def benchmark_tiled(size=10000, density=0.6, limit=3, workers=None, seed=0):
+    rng = np.random.default_rng(seed)
+    occupied = rng.random((size, size)) < density
+    print(f"{size}x{size} grid")
+
+    single = occupied.copy()
+    start_time = time.perf_counter()
+    single_removed = remove_objects_iteratively_array(single, limit)
+    single_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    tiled_removed, round_times = remove_objects_tiled(occupied, limit, workers)
+    tiled_time = time.perf_counter() - start_time
+
+    for round_number, round_time in enumerate(round_times, 1):
+        print(f"Round {round_number}: {round_time:.3f}s")
+    print(f"Single process: {single_time:.3f}s ({single_removed} removed)")
+    print(f"Tiled: {tiled_time:.3f}s ({tiled_removed} removed, {single_time / tiled_time:.2f}x speedup)")
+
+# Compare the list-of-lists grid functions against the array functions on a random grid
+def benchmark_grid(size=10000, density=0.6, limit=3, seed=0):
+    rng = np.random.default_rng(seed)
+    occupied = rng.random((size, size)) < density
+    grid = [['@' if cell else '.' for cell in row] for row in occupied.tolist()]
+    print(f"{size}x{size} grid")
+
+    start_time = time.perf_counter()
+    list_count = get_total_count_below_limit(grid, limit)
+    list_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    array_count = get_total_count_below_limit_array(occupied, limit)
+    array_time = time.perf_counter() - start_time
+    print(f"Count below limit: lists {list_time:.3f}s, array {array_time:.3f}s ({list_count} / {array_count})")
+
+    start_time = time.perf_counter()
+    list_removed = remove_objects_iteratively(grid, limit)
+    list_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    array_removed = remove_objects_iteratively_array(occupied, limit)
+    array_time = time.perf_counter() - start_time
+    print(f"Iterative removal: lists {list_time:.3f}s, array {array_time:.3f}s ({list_removed} / {array_removed})")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_grid()
+    elif len(sys.argv) > 1 and sys.argv[1] == "benchmark-tiled":
+        benchmark_tiled()
+    else:
+        main()
\ No newline at end of file
@@ -1,4 +1,27 @@
+import heapq
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+# Number of ranges sorted in memory at a time before being spilled to disk
+RUN_SIZE = 1000000
+
+# Number of ids sent to a worker at a time by the parallel membership count
+CHUNK_SIZE = 100000
+
 class Range:
+    # No per-instance __dict__, so each Range only holds its two values
+    __slots__ = ('min', 'max')
+
     def __init__(self, min, max):
         self.min = min
         self.max = max
@@ -11,6 +34,49 @@ class Range:
         # Returns the inclusive size of the range
         return self.max - self.min + 1
 
+class RangeColumns:
+    """Collection of ranges stored column by column.
+    
+    The min and max values of all ranges are kept in two typed arrays instead of
+    one object per range. Indexing or iterating yields Range views built on demand,
+    so functions that take a list of Range objects also accept a RangeColumns.
+    Values must fit in a signed 64-bit integer.
+    """
+    def __init__(self, ranges=()):
+        self.mins = array('q')
+        self.maxes = array('q')
+        for range_obj in ranges:
+            self.append(range_obj.min, range_obj.max)
+    
+    def append(self, min, max):
+        """Add the range min-max to the end of the collection."""
+        self.mins.append(min)
+        self.maxes.append(max)
+    
+    def __len__(self):
+        return len(self.mins)
+    
+    def __getitem__(self, index):
+        return Range(self.mins[index], self.maxes[index])
+    
+    def __iter__(self):
+        for min_val, max_val in zip(self.mins, self.maxes):
+            yield Range(min_val, max_val)
+    
+    def contains(self, number):
+        """Check if the number is within any of the ranges (inclusive)."""
+        for min_val, max_val in zip(self.mins, self.maxes):
+            if min_val <= number <= max_val:
+                return True
+        return False
+    
+    def size(self):
+        """Return the sum of the inclusive sizes of the ranges, overlaps included."""
+        total = 0
+        for min_val, max_val in zip(self.mins, self.maxes):
+            total += max_val - min_val + 1
+        return total
+
 def parse_range(range_string):
     """Parse a range string in the format 'min-max' into a Range object.
     
@@ -43,6 +109,25 @@ def read_ranges(file):
         ranges.append(parse_range(line))
     return ranges
 
+def read_ranges_columnar(file):
+    """Read ranges from a file until a blank line is encountered, into a RangeColumns.
+    
+    Args:
+        file: An open file object
+    
+    Returns:
+        A RangeColumns holding the ranges parsed from the file.
+    """
+    ranges = RangeColumns()
+    for line in file:
+        line = line.strip()
+        # Stop reading when we hit a blank line
+        if not line:
+            break
+        range_obj = parse_range(line)
+        ranges.append(range_obj.min, range_obj.max)
+    return ranges
+
 def read_numbers(file):
     """Read numbers from a file, one per line, until the end of the file.
     
@@ -61,6 +146,100 @@ def read_numbers(file):
         numbers.append(int(line))
     return numbers
 
+def iter_numbers(file):
+    """Yield numbers from a file, one per line, without building a list.
+    
+    Args:
+        file: An open file object (should be positioned after the blank line)
+    
+    Yields:
+        The integers read from the file.
+    """
+    for line in file:
+        line = line.strip()
+        # Skip empty lines
+        if not line:
+            continue
+        yield int(line)
+
+def write_run(run, path):
+    """Sort a run of (min, max) tuples and write it to path, one range per line."""
+    run.sort()
+    with open(path, "w") as file:
+        for min_val, max_val in run:
+            file.write(f"{min_val} {max_val}\n")
+
+def read_run(path):
+    """Yield the (min, max) tuples of a run written by write_run."""
+    with open(path, "r") as file:
+        for line in file:
+            min_val, max_val = line.split()
+            yield int(min_val), int(max_val)
+
+def iter_merged_ranges_external(file, run_size=RUN_SIZE):
+    """Merge the ranges of a file that may not fit in memory.
+    
+    Ranges are read until a blank line, as in read_ranges. Every run_size ranges
+    are sorted and spilled to a temporary file, then the runs are k-way merged and
+    combined with the same rule as merge_ranges (min <= current_max + 1), so at
+    most run_size ranges are held in memory.
+    
+    Args:
+        file: An open file object
+        run_size: The number of ranges to sort in memory at a time
+    
+    Yields:
+        The merged (min, max) tuples in increasing order.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        run_paths = []
+        run = []
+        for line in file:
+            line = line.strip()
+            # Stop reading when we hit a blank line
+            if not line:
+                break
+            range_obj = parse_range(line)
+            run.append((range_obj.min, range_obj.max))
+            if len(run) >= run_size:
+                path = os.path.join(directory, f"run{len(run_paths)}.txt")
+                write_run(run, path)
+                run_paths.append(path)
+                run = []
+        # The last run is small enough to stay in memory
+        run.sort()
+        runs = [read_run(path) for path in run_paths] + [run]
+        
+        current_min = None
+        current_max = None
+        for min_val, max_val in heapq.merge(*runs):
+            if current_min is not None and min_val <= current_max + 1:
+                # Extend the current merged range
+                current_max = max(current_max, max_val)
+            else:
+                if current_min is not None:
+                    yield current_min, current_max
+                current_min = min_val
+                current_max = max_val
+        # Don't forget the last merged range
+        if current_min is not None:
+            yield current_min, current_max
+
+def count_unique_numbers_external(file, run_size=RUN_SIZE):
+    """Count the unique numbers in the ranges of a file, with bounded memory.
+    
+    Args:
+        file: An open file object
+        run_size: The number of ranges to sort in memory at a time
+    
+    Returns:
+        The same count as count_unique_numbers_in_ranges(read_ranges(file)).
+    """
+    total = 0
+    for min_val, max_val in iter_merged_ranges_external(file, run_size):
+        total += (max_val - min_val + 1)
+    return total
+
 def is_number_in_any_range(number, ranges):
     """Check if a number is contained in any of the given ranges.
     
@@ -76,20 +255,17 @@ def is_number_in_any_range(number, ranges):
             return True
     return False
 
-def count_unique_numbers_in_ranges(ranges):
-    """Count the total number of unique numbers contained in any of the ranges.
-    
-    If a number is present in multiple ranges, it is only counted once.
-    Uses interval merging for efficiency with large ranges.
+def merge_ranges(ranges):
+    """Merge overlapping or adjacent ranges into sorted, disjoint intervals.
     
     Args:
         ranges: A list of Range objects
     
     Returns:
-        The count of unique numbers that are contained in any range.
+        A list of (min, max) tuples sorted by min, with no two overlapping or adjacent.
     """
     if not ranges:
-        return 0
+        return []
     
     # Sort ranges by min value
     sorted_ranges = sorted(ranges, key=lambda r: r.min)
@@ -112,20 +288,377 @@ def count_unique_numbers_in_ranges(ranges):
     
     # Don't forget the last merged range
     merged.append((current_min, current_max))
+    return merged
+
+def count_unique_numbers_in_ranges(ranges):
+    """Count the total number of unique numbers contained in any of the ranges.
     
+    If a number is present in multiple ranges, it is only counted once.
+    Uses interval merging for efficiency with large ranges.
+    
+    Args:
+        ranges: A list of Range objects
+    
+    Returns:
+        The count of unique numbers that are contained in any range.
+    """
     # Sum the sizes of all merged ranges
     total = 0
-    for min_val, max_val in merged:
+    for min_val, max_val in merge_ranges(ranges):
         total += (max_val - min_val + 1)
     
     return total
 
+class RangeSet:
+    """Index of the merged ranges for fast membership checks.
+    
+    The merged intervals are kept in two parallel arrays of starts and ends,
+    sorted by start, so a lookup is a binary search over the starts.
+    """
+    def __init__(self, ranges):
+        self.starts = array('q')
+        self.ends = array('q')
+        for min_val, max_val in merge_ranges(ranges):
+            self.starts.append(min_val)
+            self.ends.append(max_val)
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def contains(self, number):
+        """Check if the number is in any of the ranges, in O(log R)."""
+        # The only interval that can hold the number is the last one starting at or before it
+        index = bisect_right(self.starts, number) - 1
+        return index >= 0 and number <= self.ends[index]
+    
+    def contains_many(self, numbers):
+        """Check a sorted sequence of numbers against the ranges in one linear pass.
+        
+        Args:
+            numbers: Numbers sorted in increasing order
+        
+        Returns:
+            A list of booleans, True where the number is in any range.
+        """
+        results = []
+        index = 0
+        for number in numbers:
+            # Skip intervals that end before this number; later numbers are larger
+            while index < len(self.ends) and self.ends[index] < number:
+                index += 1
+            results.append(index < len(self.starts) and self.starts[index] <= number)
+        return results
+    
+    def size(self):
+        """Return the count of unique numbers in any of the ranges."""
+        total = 0
+        for min_val, max_val in zip(self.starts, self.ends):
+            total += (max_val - min_val + 1)
+        return total
+
+def count_numbers_in_ranges(numbers, ranges):
+    """Count how many of the numbers are in any of the ranges.
+    
+    The numbers are loaded into an int64 array and located among the merged
+    interval starts with np.searchsorted, so there is no Python-level loop.
+    If a number or range bound does not fit in int64, the count falls back to
+    binary searches over Python integers.
+    
+    Args:
+        numbers: A list of integers, as returned by read_numbers
+        ranges: A list of Range objects
+    
+    Returns:
+        The count of numbers that are in any of the ranges.
+    """
+    try:
+        range_set = RangeSet(ranges)
+        values = np.array(numbers, dtype=np.int64)
+    except OverflowError:
+        return count_numbers_in_ranges_object(numbers, ranges)
+    if len(range_set) == 0:
+        return 0
+    # Views of the index arrays, no copy is made
+    starts = np.frombuffer(range_set.starts, dtype=np.int64)
+    ends = np.frombuffer(range_set.ends, dtype=np.int64)
+    return count_in_intervals(values, starts, ends)
+
+def count_in_intervals(values, starts, ends):
+    """Count the values inside sorted, disjoint intervals.
+    
+    Args:
+        values: An int64 array of numbers
+        starts: An int64 array of interval starts, sorted and not empty
+        ends: An int64 array of the matching interval ends
+    
+    Returns:
+        The count of values inside any interval.
+    """
+    # The only interval that can hold each number is the last one starting at or before it
+    index = np.searchsorted(starts, values, side='right') - 1
+    hits = (index >= 0) & (values <= ends[np.maximum(index, 0)])
+    return int(np.count_nonzero(hits))
+
+def count_numbers_in_ranges_object(numbers, ranges):
+    """Count how many of the numbers are in any of the ranges, for numbers of any size.
+    
+    Args:
+        numbers: A list of integers
+        ranges: A list of Range objects
+    
+    Returns:
+        The count of numbers that are in any of the ranges.
+    """
+    merged = merge_ranges(ranges)
+    starts = [min_val for min_val, max_val in merged]
+    count = 0
+    for number in numbers:
+        index = bisect_right(starts, number) - 1
+        if index >= 0 and number <= merged[index][1]:
+            count += 1
+    return count
+
+class IntervalNode:
+    """One merged interval in an IntervalTree, with the treap links and the
+    count of numbers covered by its subtree."""
+    def __init__(self, min, max, priority):
+        self.min = min
+        self.max = max
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.total = max - min + 1
+
+def update_total(node):
+    """Recompute the covered count of a node's subtree from its children."""
+    node.total = node.max - node.min + 1
+    if node.left is not None:
+        node.total += node.left.total
+    if node.right is not None:
+        node.total += node.right.total
+
+def split_intervals(node, key):
+    """Split a treap into the intervals with min < key and those with min >= key."""
+    if node is None:
+        return None, None
+    if node.min < key:
+        node.right, right = split_intervals(node.right, key)
+        update_total(node)
+        return node, right
+    left, node.left = split_intervals(node.left, key)
+    update_total(node)
+    return left, node
+
+def merge_intervals(left, right):
+    """Join two treaps where every interval in left comes before every interval in right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = merge_intervals(left.right, right)
+        update_total(left)
+        return left
+    right.left = merge_intervals(left, right.left)
+    update_total(right)
+    return right
+
+def pop_last_interval(node):
+    """Detach the last interval of a treap.
+    
+    Returns:
+        A tuple of (the remaining treap, the detached node).
+    """
+    if node.right is None:
+        rest = node.left
+        node.left = None
+        update_total(node)
+        return rest, node
+    node.right, last = pop_last_interval(node.right)
+    update_total(node)
+    return node, last
+
+class IntervalTree:
+    """Mutable set of numbers stored as merged, disjoint intervals.
+    
+    The intervals are kept in a treap ordered by min, so adding or removing a
+    range, checking a number, and reading the covered count take O(log R)
+    expected time, plus the number of intervals merged away.
+    Removing a range removes every number in it from the set, even numbers that
+    were added by more than one range.
+    """
+    def __init__(self, ranges=(), seed=None):
+        self.root = None
+        self.random = random.Random(seed)
+        for range_obj in ranges:
+            self.add(range_obj.min, range_obj.max)
+    
+    def new_node(self, min_val, max_val):
+        return IntervalNode(min_val, max_val, self.random.random())
+    
+    def add(self, min_val, max_val):
+        """Add every number from min_val to max_val (inclusive) to the set."""
+        # Intervals starting in [min_val, max_val + 1] overlap or touch the new one
+        left, right = split_intervals(self.root, min_val)
+        middle, right = split_intervals(right, max_val + 2)
+        if middle is not None:
+            middle, last = pop_last_interval(middle)
+            max_val = max(max_val, last.max)
+        # The last interval starting before min_val may also reach it
+        if left is not None:
+            left, last = pop_last_interval(left)
+            if last.max >= min_val - 1:
+                min_val = last.min
+                max_val = max(max_val, last.max)
+            else:
+                left = merge_intervals(left, last)
+        node = self.new_node(min_val, max_val)
+        self.root = merge_intervals(merge_intervals(left, node), right)
+    
+    def remove(self, min_val, max_val):
+        """Remove every number from min_val to max_val (inclusive) from the set."""
+        left, right = split_intervals(self.root, min_val)
+        middle, right = split_intervals(right, max_val + 1)
+        remainder = None
+        # The last interval starting before min_val is cut short, and may continue past max_val
+        if left is not None:
+            left, last = pop_last_interval(left)
+            if last.max >= min_val:
+                if last.max > max_val:
+                    remainder = self.new_node(max_val + 1, last.max)
+                last.max = min_val - 1
+                update_total(last)
+            left = merge_intervals(left, last)
+        # Intervals starting inside the removed range are dropped, except what is past max_val
+        if middle is not None:
+            middle, last = pop_last_interval(middle)
+            if last.max > max_val:
+                remainder = self.new_node(max_val + 1, last.max)
+        self.root = merge_intervals(merge_intervals(left, remainder), right)
+    
+    def contains(self, number):
+        """Check if the number is in the set."""
+        # Find the last interval starting at or before the number
+        candidate = None
+        node = self.root
+        while node is not None:
+            if node.min <= number:
+                candidate = node
+                node = node.right
+            else:
+                node = node.left
+        return candidate is not None and number <= candidate.max
+    
+    def count(self):
+        """Return the count of unique numbers in the set."""
+        return self.root.total if self.root is not None else 0
+    
+    def intervals(self):
+        """Return the merged intervals as a sorted list of (min, max) tuples."""
+        result = []
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            result.append((node.min, node.max))
+            node = node.right
+        return result
+
+# Merged interval arrays, set once in each worker process of the parallel count
+WORKER_INTERVALS = {}
+
+def attach_intervals(starts, ends):
+    """Worker initializer: keep the merged interval arrays for every chunk."""
+    WORKER_INTERVALS['starts'] = np.frombuffer(starts, dtype=np.int64)
+    WORKER_INTERVALS['ends'] = np.frombuffer(ends, dtype=np.int64)
+
+def count_chunk_in_intervals(chunk):
+    """Worker task: count the ids of an array('q') chunk inside the merged intervals."""
+    values = np.frombuffer(chunk, dtype=np.int64)
+    return count_in_intervals(values, WORKER_INTERVALS['starts'], WORKER_INTERVALS['ends'])
+
+def count_numbers_in_ranges_parallel(numbers, ranges, workers=None, chunk_size=CHUNK_SIZE):
+    """Count how many of the numbers are in any of the ranges on a process pool.
+    
+    The merged interval arrays are sent to each worker once, when it starts.
+    The numbers are sent in chunks of chunk_size, and only a few chunks per
+    worker are in flight at once, so numbers can be any iterable, such as
+    iter_numbers(file). Chunks with numbers beyond int64 are counted in this
+    process against the already merged RangeSet.
+    
+    Args:
+        numbers: An iterable of integers
+        ranges: A list of Range objects
+        workers: The number of worker processes (defaults to the CPU count)
+        chunk_size: The number of ids sent to a worker at a time
+    
+    Returns:
+        The same count as count_numbers_in_ranges(numbers, ranges).
+    """
+    try:
+        range_set = RangeSet(ranges)
+    except OverflowError:
+        return count_numbers_in_ranges_object(numbers, ranges)
+    if len(range_set) == 0:
+        return 0
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    numbers = iter(numbers)
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=attach_intervals,
+                             initargs=(range_set.starts, range_set.ends)) as executor:
+        pending = deque()
+        while True:
+            chunk = list(islice(numbers, chunk_size))
+            if not chunk:
+                break
+            try:
+                packed = array('q', chunk)
+            except OverflowError:
+                # RangeSet.contains works on Python integers of any size
+                count += sum(1 for number in chunk if range_set.contains(number))
+                continue
+            # Wait for the oldest chunk before sending more
+            if len(pending) >= max_pending:
+                count += pending.popleft().result()
+            pending.append(executor.submit(count_chunk_in_intervals, packed))
+        while pending:
+            count += pending.popleft().result()
+    return count
+
+def benchmark_range_memory(count=10**6):
+    """Compare the memory used by a list of Range objects and a RangeColumns.
+    
+    Args:
+        count: The number of ranges to store
+    """
+    tracemalloc.start()
+    ranges = [Range(i * 10, i * 10 + 5) for i in range(count)]
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    del ranges
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    columns = RangeColumns()
+    for i in range(count):
+        columns.append(i * 10, i * 10 + 5)
+    columns_bytes = tracemalloc.get_traced_memory()[0]
+    del columns
+    tracemalloc.stop()
+
+    print(f"{count} ranges")
+    print(f"List of Range: {list_bytes / count:.1f} bytes per range")
+    print(f"RangeColumns:  {columns_bytes / count:.1f} bytes per range")
+
 def main():
     with open("inputs/day5input.txt", "r") as file:
         ranges = read_ranges(file)
         numbers = read_numbers(file)
         # Get the count of numbers that are in any of the ranges
-        count = sum(1 for number in numbers if is_number_in_any_range(number, ranges))
+        count = count_numbers_in_ranges(numbers, ranges)
         print(f"The count of numbers that are in any of the ranges is: {count}")
 
         # Count the total number of unique numbers contained in any range
@@ -134,4 +667,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_range_memory()
+    else:
+        main()
\ No newline at end of file
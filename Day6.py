@@ -1,3 +1,7 @@
+import sys
+import time
+import numpy as np
+
 def read_file_columns(file):
     """Read a file and parse numbers from columns and operations from the last row.
     
@@ -9,8 +13,17 @@ def read_file_columns(file):
         - columns: list of lists, each inner list contains numbers from one column
         - operations: list of operation characters ('+' or '*') for each column
     """
-    lines = file.readlines()
+    return columns_from_lines(file.readlines())
+
+def columns_from_lines(lines):
+    """Parse numbers from columns and operations from the last row of a list of lines.
+    
+    Args:
+        lines: The lines of the worksheet, with or without line endings
     
+    Returns:
+        The same (columns, operations) tuple as read_file_columns.
+    """
     # Separate data rows from operation row (last row)
     data_lines = lines[:-1]
     operation_line = lines[-1].strip()
@@ -98,8 +111,17 @@ def read_file_columns_stacked(file):
         - stacked_columns: list of lists, each inner list contains numbers from one problem column
         - operations: list of operation characters ('+' or '*') for each column
     """
-    lines = file.readlines()
+    return stacked_columns_from_lines(file.readlines())
+
+def stacked_columns_from_lines(lines):
+    """Parse numbers from columns using stacked parsing (right-to-left) from a list of lines.
     
+    Args:
+        lines: The lines of the worksheet, with or without line endings
+    
+    Returns:
+        The same (stacked_columns, operations) tuple as read_file_columns_stacked.
+    """
     # Separate data rows from operation row (last row)
     data_lines = [line.rstrip('\n') for line in lines[:-1]]
     operation_line = lines[-1].rstrip('\n')
@@ -168,6 +190,125 @@ def read_file_columns_stacked(file):
     # Reverse to get left-to-right order (since we processed right-to-left)
     return list(reversed(stacked_columns)), list(reversed(stacked_operations))
 
+def read_file_columns_stacked_numpy(file):
+    """Same as read_file_columns_stacked, using NumPy instead of per-character loops.
+    
+    Args:
+        file: An open file object
+    
+    Returns:
+        The same (stacked_columns, operations) tuple as read_file_columns_stacked.
+    """
+    return stacked_columns_from_lines_numpy(file.readlines())
+
+def stacked_columns_from_lines_numpy(lines):
+    """Same as stacked_columns_from_lines, using NumPy instead of per-character loops.
+    
+    The padded worksheet is loaded as a 2D uint8 character matrix. Digit and
+    separator columns are found with one reduction over the rows, and each
+    vertical number is built as a dot product of its digits with powers of ten.
+    Columns are grouped into problems by a running count of separators, and each
+    problem's operator is picked from the first or last operator column in it.
+    
+    Args:
+        lines: The lines of the worksheet, with or without line endings
+    
+    Returns:
+        The same (stacked_columns, operations) tuple as stacked_columns_from_lines.
+    """
+    lines = [line.rstrip('\n') for line in lines]
+    max_line_len = max(len(line) for line in lines)
+    try:
+        text = ''.join(line.ljust(max_line_len) for line in lines).encode('ascii')
+    except UnicodeEncodeError:
+        # Non-ASCII characters don't fit in one byte each, use the character loop
+        return stacked_columns_from_lines(lines)
+    matrix = np.frombuffer(text, dtype=np.uint8).reshape(len(lines), max_line_len)
+    data = matrix[:-1]
+    ops = matrix[-1]
+    
+    # Classify every column with one reduction over the rows
+    is_digit = (data >= ord('0')) & (data <= ord('9'))
+    has_digit = is_digit.any(axis=0)
+    has_op = (ops == ord('+')) | (ops == ord('*'))
+    is_separator = ~has_digit & (data == ord(' ')).all(axis=0) & (ops == ord(' '))
+    
+    # Each digit is weighted by 10 to the number of digits below it in its column
+    # Past 18 rows the numbers may not fit in int64, so use Python integers
+    dtype = np.int64 if len(data) <= 18 else object
+    digits_below = is_digit[::-1].cumsum(axis=0)[::-1] - is_digit
+    digit_values = np.where(is_digit, data.astype(np.int64) - ord('0'), 0).astype(dtype)
+    weights = np.power(10, digits_below.astype(dtype))
+    numbers = (digit_values * weights).sum(axis=0)
+    
+    # Give every column the id of the problem it belongs to
+    problem_ids = np.cumsum(is_separator)
+    num_problems = int(problem_ids[-1]) + 1 if max_line_len else 0
+    
+    # Problems without digits produce no column; the rest keep their order
+    digit_columns = np.flatnonzero(has_digit)
+    digit_problems = problem_ids[digit_columns]
+    counts = np.bincount(digit_problems, minlength=num_problems)
+    has_numbers = counts > 0
+    
+    # Numbers are read right to left within each problem
+    order = np.lexsort((-digit_columns, digit_problems))
+    values = numbers[digit_columns[order]].tolist()
+    offsets = np.concatenate(([0], np.cumsum(counts[has_numbers]))).tolist()
+    stacked_columns = [values[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+    
+    # Read right to left, the leftmost operator under a number wins
+    digit_ops = np.flatnonzero(has_op & has_digit)
+    leftmost_digit_op = np.zeros(num_problems, dtype=np.uint8)
+    problems, first = np.unique(problem_ids[digit_ops], return_index=True)
+    leftmost_digit_op[problems] = ops[digit_ops[first]]
+    
+    # Otherwise the first operator found reading right to left, which is the
+    # rightmost operator away from the numbers
+    other_ops = np.flatnonzero(has_op & ~has_digit)[::-1]
+    rightmost_other_op = np.zeros(num_problems, dtype=np.uint8)
+    problems, first = np.unique(problem_ids[other_ops], return_index=True)
+    rightmost_other_op[problems] = ops[other_ops[first]]
+    
+    # An operator in a problem without numbers carries over to the next problem
+    # on its left; the one nearest the problem to its right is found first
+    number_problems = np.flatnonzero(has_numbers)
+    carriers = np.flatnonzero(~has_numbers & (rightmost_other_op > 0))[::-1]
+    targets = np.searchsorted(number_problems, carriers) - 1
+    carriers, targets = carriers[targets >= 0], targets[targets >= 0]
+    carried_op = np.zeros(len(number_problems), dtype=np.uint8)
+    problems, first = np.unique(targets, return_index=True)
+    carried_op[problems] = rightmost_other_op[carriers[first]]
+    
+    operator_codes = leftmost_digit_op[number_problems]
+    operator_codes = np.where(operator_codes > 0, operator_codes, carried_op)
+    operator_codes = np.where(operator_codes > 0, operator_codes, rightmost_other_op[number_problems])
+    operator_codes = np.where(operator_codes > 0, operator_codes, ord('+'))
+    stacked_operations = [chr(code) for code in operator_codes.tolist()]
+    
+    return stacked_columns, stacked_operations
+
+def parse_worksheet(file):
+    """Read a worksheet once and build both the row-wise and the stacked column views.
+    
+    The whole file is read in a single call, as bytes or text, and split into
+    lines once; both parsers then work from the same lines.
+    
+    Args:
+        file: An open file object, in binary or text mode
+    
+    Returns:
+        A tuple of (columns, operations, stacked_columns, stacked_operations), the
+        results of read_file_columns and read_file_columns_stacked on the same file.
+    """
+    data = file.read()
+    if isinstance(data, bytes):
+        data = data.decode()
+    lines = data.splitlines()
+    columns, operations = columns_from_lines(lines)
+    stacked_columns, stacked_operations = stacked_columns_from_lines_numpy(lines)
+    return columns, operations, stacked_columns, stacked_operations
+
 def apply_operation(numbers, operation):
     """Apply an operation sequentially to a list of numbers.
     
@@ -195,33 +336,59 @@ def apply_operation(numbers, operation):
         raise ValueError(f"Unknown operation: {operation}")
 
 def main():
+    # Read and parse the worksheet once for both parts
+    with open("inputs/day6input.txt", "rb") as file:
+        columns, operations, stacked_columns, stacked_operations = parse_worksheet(file)
+    
     # Part 1: Normal parsing
-    with open("inputs/day6input.txt", "r") as file:
-        columns, operations = read_file_columns(file)
-        
-        # Apply operation to each column and collect results
-        column_results = []
-        for i, (column_numbers, operation) in enumerate(zip(columns, operations)):
-            result = apply_operation(column_numbers, operation)
-            column_results.append(result)
-        
-        # Sum all column results
-        total_sum = sum(column_results)
-        print(f"Part 1: The sum of all column results is: {total_sum}")
+    # Apply operation to each column and collect results
+    column_results = []
+    for i, (column_numbers, operation) in enumerate(zip(columns, operations)):
+        result = apply_operation(column_numbers, operation)
+        column_results.append(result)
+    
+    # Sum all column results
+    total_sum = sum(column_results)
+    print(f"Part 1: The sum of all column results is: {total_sum}")
     
     # Part 2: Stacked parsing (right-to-left)
-    with open("inputs/day6input.txt", "r") as file:
-        stacked_columns, stacked_operations = read_file_columns_stacked(file)
-        
-        # Apply operation to each stacked column and collect results
-        stacked_results = []
-        for column_numbers, operation in zip(stacked_columns, stacked_operations):
-            result = apply_operation(column_numbers, operation)
-            stacked_results.append(result)
-        
-        # Sum all stacked column results
-        stacked_total = sum(stacked_results)
-        print(f"Part 2: The sum of all stacked column results is: {stacked_total}")
+    # Apply operation to each stacked column and collect results
+    stacked_results = []
+    for column_numbers, operation in zip(stacked_columns, stacked_operations):
+        result = apply_operation(column_numbers, operation)
+        stacked_results.append(result)
+    
+    # Sum all stacked column results
+    stacked_total = sum(stacked_results)
+    print(f"Part 2: The sum of all stacked column results is: {stacked_total}")
+
+# Compare the character loop against the NumPy parser on a random worksheet
+def benchmark_stacked(num_problems=80000, rows=4, seed=0):
+    rng = np.random.default_rng(seed)
+    widths = rng.integers(1, 5, size=num_problems)
+    number_rows = []
+    for _ in range(rows):
+        digits = rng.integers(0, 10, size=widths.sum()).astype(str)
+        blanks = rng.random(widths.sum()) < 0.2
+        cells = np.where(blanks, ' ', digits)
+        number_rows.append(' '.join(''.join(cells[end - width:end]) for end, width in zip(np.cumsum(widths).tolist(), widths.tolist())))
+    operators = rng.choice(['+', '*'], size=num_problems)
+    operator_row = ' '.join(op.ljust(width) for op, width in zip(operators.tolist(), widths.tolist()))
+    lines = number_rows + [operator_row]
+    print(f"{num_problems} problems, {rows} rows")
+
+    start_time = time.perf_counter()
+    loop_result = stacked_columns_from_lines(lines)
+    loop_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    numpy_result = stacked_columns_from_lines_numpy(lines)
+    numpy_time = time.perf_counter() - start_time
+    print(f"Loop: {loop_time:.3f}s")
+    print(f"NumPy: {numpy_time:.3f}s ({loop_time / numpy_time:.2f}x speedup, results match: {loop_result == numpy_result})")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_stacked()
+        benchmark_stacked(rows=16)
+    else:
+        main()
\ No newline at end of file
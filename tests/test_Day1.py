@@ -0,0 +1,183 @@
+import pytest
+import numpy as np
+import sys
+import os
+import io
+
+# Add parent directory to path to import Day1
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Day1 import rotate, rotate_left, rotate_right, parse_instructions, simulate_batch, simulate_loop, read_instruction_chunks, DialAccumulator, MultiDialAccumulator, simulate_dials
+
+
+def step_left(num, amount):
+    """Reference implementation that moves the dial one click at a time."""
+    passed_zeros = 0
+    for i in range(amount):
+        num = (num - 1) % 100
+        if num == 0:
+            passed_zeros += 1
+    return num, passed_zeros
+
+def step_right(num, amount):
+    """Reference implementation that moves the dial one click at a time."""
+    passed_zeros = 0
+    for i in range(amount):
+        num = (num + 1) % 100
+        if num == 0:
+            passed_zeros += 1
+    return num, passed_zeros
+
+class TestRotateLeft:
+    def test_l68_from_50(self):
+        """Rotating L68 from 50 passes 0 once and lands on 82."""
+        assert rotate_left(50, 68) == (82, 1)
+
+    def test_landing_on_zero(self):
+        """Landing exactly on 0 counts as passing it."""
+        assert rotate_left(30, 30) == (0, 1)
+
+    def test_starting_on_zero(self):
+        """Starting on 0 does not count until the dial comes back around."""
+        assert rotate_left(0, 5) == (95, 0)
+        assert rotate_left(0, 100) == (0, 1)
+
+    def test_large_amount(self):
+        """A billion clicks is computed without stepping."""
+        assert rotate_left(50, 1000000000) == (50, 10000000)
+
+    def test_matches_step_by_step(self):
+        """Every start position and amount up to 250 matches the click loop."""
+        for num in range(100):
+            for amount in range(251):
+                assert rotate_left(num, amount) == step_left(num, amount)
+
+class TestRotateRight:
+    def test_r48_from_52(self):
+        """Rotating R48 from 52 lands on 0."""
+        assert rotate_right(52, 48) == (0, 1)
+
+    def test_starting_on_zero(self):
+        """Starting on 0 does not count until the dial comes back around."""
+        assert rotate_right(0, 99) == (99, 0)
+        assert rotate_right(0, 100) == (0, 1)
+
+    def test_large_amount(self):
+        """A billion clicks is computed without stepping."""
+        assert rotate_right(50, 1000000000) == (50, 10000000)
+
+    def test_matches_step_by_step(self):
+        """Every start position and amount up to 250 matches the click loop."""
+        for num in range(100):
+            for amount in range(251):
+                assert rotate_right(num, amount) == step_right(num, amount)
+
+class TestRotate:
+    def test_zero_delta(self):
+        """A rotation of 0 clicks stays put."""
+        assert rotate(0, 0) == (0, 0)
+        assert rotate(42, 0) == (42, 0)
+
+    def test_custom_size(self):
+        """The dial size can be changed."""
+        assert rotate(5, 10, size=12) == (3, 1)
+        assert rotate(5, -30, size=12) == (11, 3)
+
+class TestSimulateBatch:
+    EXAMPLE = ["L68", "L30", "R48", "L5", "R60", "L55", "L1", "L99", "R14", "L82"]
+
+    def test_parse_instructions(self):
+        """Instructions are parsed into signed clicks, skipping blank lines."""
+        assert parse_instructions(["L68\n", "R48\n", "\n"]).tolist() == [-68, 48]
+
+    def test_parse_invalid_direction(self):
+        """An unknown direction raises a ValueError."""
+        with pytest.raises(ValueError):
+            parse_instructions(["X5"])
+
+    def test_example(self):
+        """The example instructions land on 0 three times and pass it six times."""
+        assert simulate_batch(parse_instructions(self.EXAMPLE)) == (3, 6)
+
+    def test_empty(self):
+        """No instructions means no zeros."""
+        assert simulate_batch(np.array([], dtype=np.int64)) == (0, 0)
+
+    def test_matches_loop(self):
+        """Random instruction streams give the same counts as the loop."""
+        rng = np.random.default_rng(1)
+        for start in (0, 50, 99):
+            deltas = rng.integers(-1000, 1001, size=5000)
+            assert simulate_batch(deltas, start) == simulate_loop(deltas.tolist(), start)
+
+class TestReadInstructionChunks:
+    DATA = b"L68\nL30\nR48\nL5\nR60\nL55\nL1\nL99\nR14\nL82\n"
+
+    def test_single_chunk(self):
+        """A stream smaller than the chunk size yields one chunk."""
+        chunks = list(read_instruction_chunks(io.BytesIO(self.DATA)))
+        assert len(chunks) == 1
+        assert chunks[0].tolist() == [-68, -30, 48, -5, 60, -55, -1, -99, 14, -82]
+
+    def test_instructions_spanning_chunks(self):
+        """Instructions split across chunk boundaries are reassembled."""
+        for chunk_size in range(1, 12):
+            chunks = read_instruction_chunks(io.BytesIO(self.DATA), chunk_size)
+            deltas = [delta for chunk in chunks for delta in chunk.tolist()]
+            assert deltas == [-68, -30, 48, -5, 60, -55, -1, -99, 14, -82]
+
+    def test_missing_trailing_newline(self):
+        """The final instruction is read even without a trailing newline."""
+        chunks = read_instruction_chunks(io.BytesIO(b"R5\nL1000"), 4)
+        assert [delta for chunk in chunks for delta in chunk.tolist()] == [5, -1000]
+
+class TestDialAccumulator:
+    def test_resumes_across_chunks(self):
+        """Feeding chunks one at a time matches a single batch."""
+        dial = DialAccumulator()
+        for deltas in read_instruction_chunks(io.BytesIO(TestReadInstructionChunks.DATA), 7):
+            dial.feed(deltas)
+        assert dial.position == 32
+        assert (dial.part1_num_zeros, dial.part2_num_zeros) == (3, 6)
+
+    def test_empty_chunk(self):
+        """An empty chunk leaves the state unchanged."""
+        dial = DialAccumulator(start=7)
+        assert dial.feed([]) == 7
+        assert (dial.part1_num_zeros, dial.part2_num_zeros) == (0, 0)
+
+class TestMultiDial:
+    def test_example_on_standard_dial(self):
+        """A single standard dial matches the single dial simulation."""
+        deltas = parse_instructions(TestSimulateBatch.EXAMPLE)
+        part1, part2 = simulate_dials(deltas, [50])
+        assert (part1.tolist(), part2.tolist()) == ([3], [6])
+
+    def test_each_dial_matches_loop(self):
+        """Every dial gets the same counts as simulating it on its own."""
+        rng = np.random.default_rng(2)
+        deltas = rng.integers(-500, 501, size=2000)
+        starts = [0, 5, 50, 99, 3]
+        sizes = [100, 10, 60, 100, 7]
+        part1, part2 = simulate_dials(deltas, starts, sizes)
+        for i in range(len(starts)):
+            assert (part1[i], part2[i]) == simulate_loop(deltas.tolist(), starts[i], sizes[i])
+
+    def test_resumes_across_chunks_and_blocks(self):
+        """Small blocks and several chunks give the same result as one pass."""
+        rng = np.random.default_rng(4)
+        deltas = rng.integers(-300, 301, size=1000)
+        starts, sizes = [1, 2, 3, 4], [11, 50, 100, 3]
+        dials = MultiDialAccumulator(starts, sizes, block_cells=10)
+        dials.feed(deltas[:333])
+        dials.feed(deltas[333:])
+        part1, part2 = simulate_dials(deltas, starts, sizes)
+        assert dials.part1_num_zeros.tolist() == part1.tolist()
+        assert dials.part2_num_zeros.tolist() == part2.tolist()
+
+    def test_invalid_size(self):
+        """Dial sizes must be positive."""
+        with pytest.raises(ValueError):
+            MultiDialAccumulator([0], [0])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -4,7 +4,9 @@ import os
 
 # Add parent directory to path to import Day2
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from Day2 import is_valid_basic, is_valid_complete
+from Day2 import is_valid_basic, is_valid_complete, generate_invalid_ids, sum_invalid_ids, parse_ranges, merge_ranges, iter_invalid_ids_in_ranges, sum_invalid_ids_in_ranges
+from Day2 import is_valid_basic_numeric, is_valid_complete_numeric, digit_count
+from Day2 import shard_ranges, sum_invalid_ids_parallel
 
 
 class TestIsValidBasic:
@@ -73,6 +75,155 @@ class TestIsValidComplete:
         """ID 2121212121 should be invalid (False)"""
         assert is_valid_complete(2121212121) == False
 
+def invalid_ids_by_scan(start, end):
+    """Reference: check every id in the range."""
+    return [id for id in range(start, end + 1) if not is_valid_complete(id)]
+
+class TestGenerateInvalidIds:
+    """Test cases for the generate_invalid_ids function"""
+
+    def test_11_22(self):
+        """The range 11-22 contains 11 and 22"""
+        assert list(generate_invalid_ids(11, 22)) == [11, 22]
+
+    def test_95_115(self):
+        """The range 95-115 contains 99 and 111"""
+        assert list(generate_invalid_ids(95, 115)) == [99, 111]
+
+    def test_998_1012(self):
+        """The range 998-1012 contains 999 and 1010"""
+        assert list(generate_invalid_ids(998, 1012)) == [999, 1010]
+
+    def test_no_duplicates(self):
+        """222222 repeats with blocks of 1, 2 and 3 digits but is listed once"""
+        assert list(generate_invalid_ids(222220, 222224)) == [222222]
+
+    def test_empty_range(self):
+        """Ranges without invalid ids produce nothing"""
+        assert list(generate_invalid_ids(1698522, 1698528)) == []
+        assert list(generate_invalid_ids(0, 10)) == []
+
+    def test_matches_scan(self):
+        """Every id up to 200000 matches checking each id"""
+        assert list(generate_invalid_ids(1, 200000)) == invalid_ids_by_scan(1, 200000)
+
+class TestSumInvalidIds:
+    """Test cases for the sum_invalid_ids function"""
+
+    def test_example_ranges(self):
+        """The example ranges sum to the expected totals"""
+        assert sum_invalid_ids(11, 22) == 33
+        assert sum_invalid_ids(95, 115) == 210
+        assert sum_invalid_ids(1188511880, 1188511890) == 1188511885
+
+    def test_matches_scan(self):
+        """Sums over assorted ranges match checking each id"""
+        for start, end in [(1, 200000), (998, 1012), (222220, 222224), (565653, 565659), (824824821, 824824827)]:
+            assert sum_invalid_ids(start, end) == sum(invalid_ids_by_scan(start, end))
+
+    def test_matches_generator_on_wide_range(self):
+        """The closed form agrees with listing the ids on a wide range"""
+        assert sum_invalid_ids(1, 10 ** 8) == sum(generate_invalid_ids(1, 10 ** 8))
+
+class TestParseRanges:
+    """Test cases for the parse_ranges function"""
+
+    def test_parse_line(self):
+        """A line of comma separated ranges becomes a list of tuples"""
+        assert parse_ranges("11-22,95-115,998-1012\n") == [(11, 22), (95, 115), (998, 1012)]
+
+    def test_trailing_comma(self):
+        """Empty groups are skipped"""
+        assert parse_ranges("11-22,\n") == [(11, 22)]
+
+class TestMergeRanges:
+    """Test cases for the merge_ranges function"""
+
+    def test_overlapping(self):
+        """Overlapping ranges are merged"""
+        assert merge_ranges([(10, 20), (15, 30)]) == [(10, 30)]
+
+    def test_adjacent(self):
+        """Adjacent ranges are merged"""
+        assert merge_ranges([(10, 20), (21, 30)]) == [(10, 30)]
+
+    def test_disjoint_unsorted(self):
+        """Disjoint ranges are sorted but kept apart"""
+        assert merge_ranges([(50, 60), (10, 20)]) == [(10, 20), (50, 60)]
+
+    def test_contained(self):
+        """A range inside another disappears"""
+        assert merge_ranges([(10, 100), (20, 30)]) == [(10, 100)]
+
+class TestSumInvalidIdsInRanges:
+    """Test cases for summing invalid ids across several ranges"""
+
+    def test_overlaps_counted_once(self):
+        """Ids in overlapping ranges are only added once"""
+        assert sum_invalid_ids_in_ranges([(11, 22), (20, 33)]) == 11 + 22 + 33
+
+    def test_duplicate_ranges(self):
+        """The same range listed twice counts once"""
+        assert sum_invalid_ids_in_ranges([(95, 115), (95, 115)]) == 210
+
+    def test_stream_matches_sum(self):
+        """The streamed ids add up to the same total"""
+        ranges = [(1, 5000), (4000, 12000), (998, 1012), (222220, 222224)]
+        ids = list(iter_invalid_ids_in_ranges(ranges))
+        assert ids == sorted(set(ids))
+        assert sum(ids) == sum_invalid_ids_in_ranges(ranges)
+
+class TestNumericChecks:
+    """Test cases for the arithmetic validity checks"""
+
+    def test_digit_count(self):
+        """Digits are counted without strings, including 0 and very large ids"""
+        for id in [0, 1, 9, 10, 99, 100, 123456789, 10 ** 39 - 1, 10 ** 39, 10 ** 50 + 7]:
+            assert digit_count(id) == len(str(id))
+
+    def test_basic_examples(self):
+        """The basic examples give the same answers as is_valid_basic"""
+        for id in [11, 20, 101, 1010, 1698522, 38593859]:
+            assert is_valid_basic_numeric(id) == is_valid_basic(id)
+
+    def test_complete_examples(self):
+        """The complete examples give the same answers as is_valid_complete"""
+        for id in [11, 20, 101, 1010, 1698522, 38593859, 121212, 121314, 2121212121]:
+            assert is_valid_complete_numeric(id) == is_valid_complete(id)
+
+    def test_matches_string_checks(self):
+        """Every id up to 100000, plus some long ids, matches the string checks"""
+        ids = list(range(100000)) + [int("123" * 20), int("9" * 45), int("12" * 21) + 1]
+        for id in ids:
+            assert is_valid_basic_numeric(id) == is_valid_basic(id)
+            assert is_valid_complete_numeric(id) == is_valid_complete(id)
+
+class TestParallel:
+    """Test cases for the sharded multiprocess evaluation"""
+
+    RANGES = [(11, 22), (95, 115), (998, 1012), (1, 200000), (150000, 3000000), (1188511880, 1188511890)]
+
+    def test_shard_ranges(self):
+        """Merged ranges are cut into shards no wider than the shard size"""
+        assert shard_ranges([(1, 10), (5, 12), (20, 21)], 5) == [(1, 5), (6, 10), (11, 12), (20, 21)]
+
+    def test_shard_ranges_invalid_size(self):
+        """Shard sizes below 1 are rejected"""
+        with pytest.raises(ValueError):
+            shard_ranges([(1, 10)], 0)
+
+    def test_matches_single_process(self):
+        """The parallel sum matches the single process sum"""
+        assert sum_invalid_ids_parallel(self.RANGES, workers=2) == sum_invalid_ids_in_ranges(self.RANGES)
+
+    def test_custom_shard_size(self):
+        """Small shards give the same sum"""
+        assert sum_invalid_ids_parallel(self.RANGES, workers=2, shard_size=9999) == sum_invalid_ids_in_ranges(self.RANGES)
+
+    def test_no_ranges(self):
+        """No ranges sum to 0"""
+        assert sum_invalid_ids_parallel([], workers=2) == 0
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -1,10 +1,12 @@
 import pytest
+import numpy as np
 import sys
 import os
 
 # Add parent directory to path to import Day2
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from Day3 import part_one, find_battery_output
+from Day3 import part_one, find_battery_output, largest_subsequence, BatteryIndex
+from Day3 import score_banks, score_bank_bytes, score_lines, score_banks_parallel
 
 class TestPartOne:
     # Test the part_one function in this class
@@ -96,5 +98,122 @@ class TestFindBatteryOutput:
         assert find_battery_output("1234", 2) == 34
         assert find_battery_output("5678", 3) == 678
 
+    def test_line_shorter_than_num_digits(self):
+        """Lines with fewer digits than requested give 0."""
+        assert find_battery_output("123", 12) == 0
+        assert find_battery_output("\n", 2) == 0
+
+    def test_trailing_newline(self):
+        """The newline at the end of an input line is ignored."""
+        assert find_battery_output("818181911112111\n", 12) == 888911112111
+
+class TestLargestSubsequence:
+    # Test the largest_subsequence function in this class
+
+    def test_bytes_input(self):
+        """Digits can be passed directly as bytes."""
+        assert largest_subsequence(b"987654321111111", 12) == 987654321111
+        assert largest_subsequence(b"234234234234278", 2) == 78
+
+    def test_equal_digits(self):
+        """Runs of equal digits are kept in order."""
+        assert largest_subsequence(b"99199", 4) == 9999
+        assert largest_subsequence(b"55555", 3) == 555
+
+    def test_zero_digits(self):
+        """Asking for no digits gives 0."""
+        assert largest_subsequence(b"123", 0) == 0
+
+class TestBatteryIndex:
+    # Test the BatteryIndex class in this class
+
+    def test_examples(self):
+        """The index gives the example answers for 2 and 12 digits."""
+        assert BatteryIndex("987654321111111").query_many([2, 12]) == [98, 987654321111]
+        assert BatteryIndex("818181911112111\n").query_many([2, 12]) == [92, 888911112111]
+
+    def test_max_index_prefers_first(self):
+        """Ties between equal digits pick the earliest index."""
+        index = BatteryIndex("1919")
+        assert index.max_index(0, 3) == 1
+        assert index.max_index(2, 3) == 3
+
+    def test_short_line(self):
+        """Asking for more digits than the line has gives 0."""
+        assert BatteryIndex("1234").query_many([4, 5]) == [1234, 0]
+
+    def test_matches_find_battery_output(self):
+        """Every digit count from 1 to 64 matches find_battery_output."""
+        line = "2342342342342783141592653589793238462643383279502884197169399375105820974944"
+        assert BatteryIndex(line).query_many(range(1, 65)) == [find_battery_output(line, k) for k in range(1, 65)]
+
+class TestScoreBanks:
+    # Test the batch scoring functions in this class
+
+    EXAMPLE = b"987654321111111\n811111111111119\n234234234234278\n818181911112111\n"
+
+    def score(self, data, digit_counts=(2, 12)):
+        return score_bank_bytes(np.frombuffer(data, dtype=np.uint8), digit_counts)
+
+    def test_example(self):
+        """The example banks sum to 357 for part one and 3121910778619 for part two."""
+        assert self.score(self.EXAMPLE) == [357, 3121910778619]
+
+    def test_no_trailing_newline(self):
+        """The last bank is scored even without a newline after it."""
+        assert self.score(self.EXAMPLE.rstrip()) == [357, 3121910778619]
+
+    def test_windows_line_endings(self):
+        """Carriage returns are ignored."""
+        assert self.score(self.EXAMPLE.replace(b"\n", b"\r\n")) == [357, 3121910778619]
+
+    def test_empty_windows_lines(self):
+        """Lines that only hold a carriage return score 0."""
+        assert self.score(b"\r\n") == [0, 0]
+        assert self.score(b"\r\n\r\n") == [0, 0]
+
+    def test_ragged_lines(self):
+        """Lines of different lengths fall back to scoring each line."""
+        data = b"987654321111111\n1234\n\n811111111111119\n"
+        expected = [sum(find_battery_output(line, k) for line in data.decode().splitlines()) for k in (2, 12)]
+        assert self.score(data) == expected
+
+    def test_more_digits_than_width(self):
+        """Digit counts longer than the banks score 0."""
+        assert self.score(b"12\n34\n", (1, 3)) == [6, 0]
+
+    def test_score_banks_file(self, tmp_path):
+        """Banks are read from a memory-mapped file."""
+        path = tmp_path / "banks.txt"
+        path.write_bytes(self.EXAMPLE)
+        assert score_banks(path, (2, 12)) == [357, 3121910778619]
+
+    def test_score_banks_empty_file(self, tmp_path):
+        """An empty file scores 0."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        assert score_banks(path, (2, 12)) == [0, 0]
+
+class TestScoreBanksParallel:
+    # Test the parallel scoring functions in this class
+
+    def test_score_lines(self):
+        """A batch of lines is scored for each number of digits."""
+        lines = TestScoreBanks.EXAMPLE.splitlines(keepends=True)
+        assert score_lines(lines, (2, 12)) == [357, 3121910778619]
+
+    def test_matches_batch(self, tmp_path):
+        """Small batches on two workers give the same sums as the batch scorer."""
+        path = tmp_path / "banks.txt"
+        path.write_bytes(TestScoreBanks.EXAMPLE * 25 + b"1234\n\n")
+        expected = score_banks(path, (1, 2, 12))
+        assert score_banks_parallel(path, (1, 2, 12), workers=2, batch_size=7, max_pending=2) == expected
+
+    def test_empty_file(self, tmp_path):
+        """An empty file scores 0."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        assert score_banks_parallel(path, (2, 12), workers=2) == [0, 0]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
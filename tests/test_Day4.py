@@ -1,10 +1,41 @@
 import pytest
+import numpy as np
 import sys
 import os
+import io
+import copy
 
 # Add parent directory to path to import Day2
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from Day4 import build_grid, count_surrounding_objects, get_total_count_below_limit
+from Day4 import remove_objects_iteratively, iter_removal_rounds
+from Day4 import build_grid_array, grid_to_array, count_neighbors_array, get_total_count_below_limit_array, remove_objects_iteratively_array
+from Day4 import BitGrid, pack_row, remove_objects_tiled
+from Day4 import count_below_limit_streaming, pack_grid_file, remove_objects_out_of_core
+
+SMALL_GRID = """..@@.@@@@.
+@@@.@.@.@@
+@@@@@.@.@@
+@.@@@@..@.
+@@.@@@@.@@
+.@@@@@@@.@
+.@.@.@.@@@
+@.@@@.@@@@
+.@@@@@@@@.
+@.@.@@@.@.
+"""
+
+def rescan_rounds(grid, limit):
+    """Reference: rescan the whole grid every round and return the sorted removals."""
+    rounds = []
+    while True:
+        to_remove = [(x, y) for y in range(len(grid)) for x in range(len(grid[y]))
+                     if grid[y][x] == '@' and count_surrounding_objects(grid, x, y) <= limit]
+        if not to_remove:
+            return rounds
+        for x, y in to_remove:
+            grid[y][x] = 'X'
+        rounds.append(sorted(to_remove))
 
 class TestGridBuild:
    def test_grid_build(self):
@@ -57,3 +88,163 @@ class TestGetTotalCountBelowLimit:
             assert get_total_count_below_limit(grid, 5) == 41
             # Limit 0: objects with 0 surrounding objects
             assert get_total_count_below_limit(grid, 0) == 0
+
+class TestRemoveObjectsIteratively:
+    def test_small_grid(self):
+        "43 objects are removed from the small grid with limit 3"
+        grid = build_grid(io.StringIO(SMALL_GRID))
+        assert remove_objects_iteratively(grid, 3) == 43
+
+    def test_rounds_match_rescan(self):
+        "Each round removes the same objects as rescanning the whole grid"
+        for limit in range(-1, 9):
+            grid = build_grid(io.StringIO(SMALL_GRID))
+            reference = copy.deepcopy(grid)
+            rounds = [sorted(removed) for removed in iter_removal_rounds(grid, limit)]
+            assert rounds == rescan_rounds(reference, limit)
+            assert grid == reference
+
+    def test_first_round_matches_count_below_limit(self):
+        "The first round removes every object counted by get_total_count_below_limit"
+        grid = build_grid(io.StringIO(SMALL_GRID))
+        expected = get_total_count_below_limit(grid, 3)
+        assert len(next(iter_removal_rounds(grid, 3))) == expected
+
+    def test_empty_grid(self):
+        "Nothing is removed from an empty grid"
+        assert remove_objects_iteratively([], 3) == 0
+
+class TestGridArray:
+    def test_build_grid_array(self):
+        "The array has True wherever the grid has an object"
+        occupied = build_grid_array(io.StringIO(SMALL_GRID))
+        assert occupied.shape == (10, 10)
+        assert occupied[0].tolist() == [False, False, True, True, False, True, True, True, True, False]
+
+    def test_count_neighbors_array(self):
+        "Neighbor counts match count_surrounding_objects everywhere"
+        grid = build_grid(io.StringIO(SMALL_GRID))
+        counts = count_neighbors_array(grid_to_array(grid))
+        for y in range(len(grid)):
+            for x in range(len(grid[y])):
+                assert counts[y, x] == count_surrounding_objects(grid, x, y)
+
+    def test_count_below_limit_array(self):
+        "Counts below each limit match the list version"
+        occupied = build_grid_array(io.StringIO(SMALL_GRID))
+        assert [get_total_count_below_limit_array(occupied, limit) for limit in (3, 2, 4, 5, 0)] == [13, 4, 30, 41, 0]
+
+    def test_remove_objects_iteratively_array(self):
+        "Iterative removal gives the same total and final grid as the list version"
+        for limit in range(-1, 9):
+            grid = build_grid(io.StringIO(SMALL_GRID))
+            occupied = grid_to_array(grid)
+            assert remove_objects_iteratively_array(occupied, limit) == remove_objects_iteratively(grid, limit)
+            assert np.array_equal(occupied, grid_to_array(grid))
+
+    def test_random_grids(self):
+        "Random grids give the same totals as the list version"
+        rng = np.random.default_rng(0)
+        for density in (0.3, 0.6, 0.9):
+            occupied = rng.random((30, 40)) < density
+            grid = [['@' if cell else '.' for cell in row] for row in occupied.tolist()]
+            assert remove_objects_iteratively_array(occupied, 3) == remove_objects_iteratively(grid, 3)
+
+class TestBitGrid:
+    def test_pack_row(self):
+        "Bit x of a packed row is set when column x has an object"
+        assert pack_row("@.@@\n") == 0b1101
+        assert pack_row("X@.") == 0b010
+        assert pack_row("") == 0
+
+    def test_pack_row_other_characters(self):
+        "Any character other than '@' is an empty cell, as in the list functions"
+        assert pack_row("@#@\n") == 0b101
+        assert pack_row("é@ ?") == 0b0010
+
+    def test_other_characters_match_list_version(self):
+        "Grids with other characters give the same counts in every bit-packed mode"
+        text = "@#@@\n@@?@\n#@@@\n"
+        grid = build_grid(io.StringIO(text))
+        bits = BitGrid.from_file(io.StringIO(text))
+        assert bits.count_below_limit(3) == get_total_count_below_limit(grid, 3)
+        assert count_below_limit_streaming(io.StringIO(text), 3) == get_total_count_below_limit(grid, 3)
+        assert bits.remove_iteratively(3) == remove_objects_iteratively(grid, 3)
+
+    def test_from_file(self):
+        "Rows are packed from the input file"
+        bits = BitGrid.from_file(io.StringIO(SMALL_GRID))
+        assert bits.width == 10
+        assert bits.count() == sum(row.count('@') for row in SMALL_GRID.split())
+
+    def test_count_below_limit(self):
+        "Counts below each limit match the list version"
+        bits = BitGrid.from_file(io.StringIO(SMALL_GRID))
+        assert [bits.count_below_limit(limit) for limit in (3, 2, 4, 5, 0)] == [13, 4, 30, 41, 0]
+
+    def test_remove_iteratively(self):
+        "Iterative removal gives the same total and final grid as the list version"
+        for limit in range(-1, 9):
+            grid = build_grid(io.StringIO(SMALL_GRID))
+            bits = BitGrid.from_grid(grid)
+            assert bits.remove_iteratively(limit) == remove_objects_iteratively(grid, limit)
+            assert bits.rows == BitGrid.from_grid(grid).rows
+
+    def test_wide_random_grids(self):
+        "Rows wider than a machine word give the same totals as the list version"
+        rng = np.random.default_rng(1)
+        for density in (0.3, 0.6, 0.9):
+            occupied = rng.random((20, 150)) < density
+            grid = [['@' if cell else '.' for cell in row] for row in occupied.tolist()]
+            bits = BitGrid.from_grid(grid)
+            assert bits.count_below_limit(3) == get_total_count_below_limit(grid, 3)
+            assert bits.remove_iteratively(3) == remove_objects_iteratively(grid, 3)
+
+class TestRemoveObjectsTiled:
+    def test_small_grid(self):
+        "The tiled engine removes 43 objects from the small grid with limit 3"
+        occupied = build_grid_array(io.StringIO(SMALL_GRID))
+        total_removed, round_times = remove_objects_tiled(occupied, 3, workers=2, bands=3)
+        assert total_removed == 43
+        assert not occupied.any() or get_total_count_below_limit_array(occupied, 3) == 0
+        assert len(round_times) > 0
+
+    def test_matches_single_process(self):
+        "Bands of different sizes give the same totals and final grid as one process"
+        rng = np.random.default_rng(2)
+        for bands in (1, 2, 5, 40):
+            occupied = rng.random((37, 23)) < 0.7
+            expected = occupied.copy()
+            expected_removed = remove_objects_iteratively_array(expected, 3)
+            total_removed, round_times = remove_objects_tiled(occupied, 3, workers=2, bands=bands)
+            assert total_removed == expected_removed
+            assert np.array_equal(occupied, expected)
+
+class TestOutOfCore:
+    def test_count_below_limit_streaming(self):
+        "Streaming counts below each limit match the list version"
+        counts = [count_below_limit_streaming(io.StringIO(SMALL_GRID), limit) for limit in (3, 2, 4, 5, 0)]
+        assert counts == [13, 4, 30, 41, 0]
+
+    def test_count_below_limit_streaming_empty(self):
+        "An empty file has nothing below the limit"
+        assert count_below_limit_streaming(io.StringIO(""), 3) == 0
+
+    def test_remove_objects_out_of_core(self, tmp_path):
+        "Removal on a packed file matches the list version and updates the file"
+        path = tmp_path / "grid.bin"
+        pack_grid_file(io.StringIO(SMALL_GRID), path)
+        assert remove_objects_out_of_core(path, 3) == 43
+        # Everything left has more than 3 neighbors, so a second run removes nothing
+        assert remove_objects_out_of_core(path, 3) == 0
+
+    def test_random_grids(self, tmp_path):
+        "Random grids give the same totals as the list version"
+        rng = np.random.default_rng(3)
+        path = tmp_path / "grid.bin"
+        for density in (0.3, 0.6, 0.9):
+            occupied = rng.random((25, 70)) < density
+            text = "".join("".join('@' if cell else '.' for cell in row) + "\n" for row in occupied.tolist())
+            grid = build_grid(io.StringIO(text))
+            pack_grid_file(io.StringIO(text), path)
+            assert remove_objects_out_of_core(path, 3) == remove_objects_iteratively(grid, 3)
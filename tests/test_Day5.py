@@ -1,10 +1,16 @@
 import pytest
 import sys
 import os
+import io
+import random
 
 # Add parent directory to path to import Day5
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from Day5 import Range, parse_range, read_ranges, read_numbers, is_number_in_any_range, count_unique_numbers_in_ranges
+from Day5 import merge_ranges, RangeSet, count_numbers_in_ranges, count_numbers_in_ranges_object
+from Day5 import IntervalTree, RangeColumns, read_ranges_columnar
+from Day5 import iter_numbers, iter_merged_ranges_external, count_unique_numbers_external
+from Day5 import count_numbers_in_ranges_parallel
 
 class TestRange:
     def test_range_creation(self):
@@ -312,6 +318,287 @@ class TestCountUniqueNumbersInRanges:
         # Unique: 1, 2, 3, 4, 5, 6, 7, 8, 9 = 9 numbers
         assert count_unique_numbers_in_ranges(ranges) == 9
 
+class TestMergeRanges:
+    def test_merge_example(self):
+        """Test merging the example ranges."""
+        ranges = [Range(3, 5), Range(10, 14), Range(16, 20), Range(12, 18)]
+        assert merge_ranges(ranges) == [(3, 5), (10, 20)]
+    
+    def test_merge_adjacent(self):
+        """Test that adjacent ranges are merged."""
+        assert merge_ranges([Range(1, 2), Range(3, 4)]) == [(1, 4)]
+    
+    def test_merge_empty(self):
+        """Test merging no ranges."""
+        assert merge_ranges([]) == []
+
+class TestRangeSet:
+    RANGES = [Range(3, 5), Range(10, 14), Range(16, 20), Range(12, 18)]
+    
+    def test_range_set_arrays(self):
+        """Test that the merged starts and ends are stored in parallel arrays."""
+        range_set = RangeSet(self.RANGES)
+        assert list(range_set.starts) == [3, 10]
+        assert list(range_set.ends) == [5, 20]
+        assert len(range_set) == 2
+    
+    def test_range_set_contains(self):
+        """Test that contains agrees with is_number_in_any_range."""
+        range_set = RangeSet(self.RANGES)
+        for number in range(0, 25):
+            assert range_set.contains(number) == is_number_in_any_range(number, self.RANGES)
+    
+    def test_range_set_contains_many(self):
+        """Test checking a sorted list of numbers in one pass."""
+        range_set = RangeSet(self.RANGES)
+        assert range_set.contains_many([1, 5, 8, 11, 17, 32]) == [False, True, False, True, True, False]
+    
+    def test_range_set_contains_many_matches_contains(self):
+        """Test that contains_many agrees with contains, including repeated numbers."""
+        range_set = RangeSet(self.RANGES + [Range(22, 22)])
+        numbers = sorted([0, 3, 3, 5, 6, 9, 10, 20, 21, 22, 22, 23, 100])
+        assert range_set.contains_many(numbers) == [range_set.contains(number) for number in numbers]
+    
+    def test_range_set_size(self):
+        """Test that size matches count_unique_numbers_in_ranges."""
+        assert RangeSet(self.RANGES).size() == 14
+    
+    def test_range_set_empty(self):
+        """Test an index with no ranges."""
+        range_set = RangeSet([])
+        assert range_set.contains(5) == False
+        assert range_set.contains_many([1, 2]) == [False, False]
+        assert range_set.size() == 0
+    
+    def test_range_set_large_numbers(self):
+        """Test membership with numbers from the real input's scale."""
+        range_set = RangeSet([Range(273755558074670, 273755558074680)])
+        assert range_set.contains(273755558074677) == True
+        assert range_set.contains(473129501945828) == False
+
+class TestCountNumbersInRanges:
+    RANGES = [Range(3, 5), Range(10, 14), Range(16, 20), Range(12, 18)]
+    NUMBERS = [1, 5, 8, 11, 17, 32]
+    
+    def test_count_example(self):
+        """Test counting the example numbers: 5, 11 and 17 are fresh."""
+        assert count_numbers_in_ranges(self.NUMBERS, self.RANGES) == 3
+    
+    def test_count_object_path(self):
+        """Test the Python integer path on the example."""
+        assert count_numbers_in_ranges_object(self.NUMBERS, self.RANGES) == 3
+    
+    def test_count_unsorted_and_duplicates(self):
+        """Test that unsorted and repeated numbers are each counted."""
+        assert count_numbers_in_ranges([17, 5, 5, 32, 3], self.RANGES) == 4
+    
+    def test_count_empty(self):
+        """Test counting with no numbers or no ranges."""
+        assert count_numbers_in_ranges([], self.RANGES) == 0
+        assert count_numbers_in_ranges(self.NUMBERS, []) == 0
+    
+    def test_count_beyond_int64(self):
+        """Test that numbers beyond int64 fall back to the Python integer path."""
+        ranges = [Range(1, 3), Range(2 ** 70, 2 ** 70 + 5)]
+        assert count_numbers_in_ranges([2, 2 ** 70 + 1, 2 ** 71], ranges) == 2
+        assert count_numbers_in_ranges([2, 2 ** 64], [Range(1, 3)]) == 1
+    
+    def test_count_matches_is_number_in_any_range(self):
+        """Test that the count agrees with checking each number against each range."""
+        ranges = [Range(-5, 0), Range(7, 7), Range(30, 45), Range(40, 60), Range(62, 70)]
+        numbers = list(range(-10, 80))
+        expected = sum(1 for number in numbers if is_number_in_any_range(number, ranges))
+        assert count_numbers_in_ranges(numbers, ranges) == expected
+
+class TestIntervalTree:
+    def test_build_from_ranges(self):
+        """Test that the example ranges are merged on insert."""
+        tree = IntervalTree([Range(3, 5), Range(10, 14), Range(16, 20), Range(12, 18)])
+        assert tree.intervals() == [(3, 5), (10, 20)]
+        assert tree.count() == 14
+    
+    def test_add_adjacent(self):
+        """Test that adjacent ranges are merged."""
+        tree = IntervalTree()
+        tree.add(1, 2)
+        tree.add(5, 6)
+        tree.add(3, 4)
+        assert tree.intervals() == [(1, 6)]
+    
+    def test_add_spanning(self):
+        """Test that a range covering several intervals absorbs them."""
+        tree = IntervalTree([Range(1, 2), Range(5, 6), Range(9, 10)])
+        tree.add(2, 9)
+        assert tree.intervals() == [(1, 10)]
+        assert tree.count() == 10
+    
+    def test_remove_splits_interval(self):
+        """Test that removing the middle of an interval splits it in two."""
+        tree = IntervalTree([Range(1, 10)])
+        tree.remove(4, 6)
+        assert tree.intervals() == [(1, 3), (7, 10)]
+        assert tree.count() == 7
+    
+    def test_remove_across_intervals(self):
+        """Test removing a range that trims one interval, drops one and trims another."""
+        tree = IntervalTree([Range(1, 5), Range(8, 9), Range(12, 20)])
+        tree.remove(4, 14)
+        assert tree.intervals() == [(1, 3), (15, 20)]
+    
+    def test_remove_missing(self):
+        """Test that removing numbers not in the set changes nothing."""
+        tree = IntervalTree([Range(3, 5)])
+        tree.remove(7, 9)
+        assert tree.intervals() == [(3, 5)]
+    
+    def test_contains(self):
+        """Test membership after adds and removes."""
+        tree = IntervalTree([Range(3, 5), Range(10, 14)])
+        tree.remove(11, 11)
+        assert [tree.contains(number) for number in (2, 3, 5, 6, 10, 11, 12, 15)] == \
+            [False, True, True, False, True, False, True, False]
+    
+    def test_empty(self):
+        """Test an empty tree."""
+        tree = IntervalTree()
+        assert tree.count() == 0
+        assert tree.contains(0) == False
+        assert tree.intervals() == []
+    
+    def test_matches_set(self):
+        """Test a random sequence of adds and removes against a Python set."""
+        rng = random.Random(0)
+        tree = IntervalTree(seed=1)
+        expected = set()
+        for _ in range(300):
+            min_val = rng.randint(0, 200)
+            max_val = min_val + rng.randint(0, 20)
+            if rng.random() < 0.6:
+                tree.add(min_val, max_val)
+                expected |= set(range(min_val, max_val + 1))
+            else:
+                tree.remove(min_val, max_val)
+                expected -= set(range(min_val, max_val + 1))
+            assert tree.count() == len(expected)
+        assert [number for number in range(-5, 230) if tree.contains(number)] == sorted(expected)
+
+class TestRangeColumns:
+    RANGES = [Range(3, 5), Range(10, 14), Range(16, 20), Range(12, 18)]
+    
+    def test_range_has_no_dict(self):
+        """Test that Range uses __slots__ instead of an instance __dict__."""
+        assert not hasattr(Range(3, 5), '__dict__')
+    
+    def test_columns_store_arrays(self):
+        """Test that mins and maxes are stored in typed arrays."""
+        columns = RangeColumns(self.RANGES)
+        assert list(columns.mins) == [3, 10, 16, 12]
+        assert list(columns.maxes) == [5, 14, 20, 18]
+        assert len(columns) == 4
+    
+    def test_columns_range_views(self):
+        """Test that indexing and iterating give Range objects."""
+        columns = RangeColumns(self.RANGES)
+        assert (columns[1].min, columns[1].max) == (10, 14)
+        assert [(r.min, r.max) for r in columns] == [(3, 5), (10, 14), (16, 20), (12, 18)]
+    
+    def test_columns_contains(self):
+        """Test that contains agrees with is_number_in_any_range."""
+        columns = RangeColumns(self.RANGES)
+        for number in range(0, 25):
+            assert columns.contains(number) == is_number_in_any_range(number, self.RANGES)
+    
+    def test_columns_size(self):
+        """Test that size adds up the size of each range."""
+        assert RangeColumns(self.RANGES).size() == 3 + 5 + 5 + 7
+    
+    def test_columns_work_with_range_functions(self):
+        """Test that the range functions accept a RangeColumns."""
+        columns = RangeColumns(self.RANGES)
+        assert count_unique_numbers_in_ranges(columns) == 14
+        assert is_number_in_any_range(17, columns) == True
+        assert RangeSet(columns).contains_many([1, 5, 8, 11, 17, 32]) == [False, True, False, True, True, False]
+    
+    def test_read_ranges_columnar(self):
+        """Test reading ranges into columns, stopping at the blank line."""
+        file = io.StringIO("3-5\n10-14\n\n16-20\n")
+        columns = read_ranges_columnar(file)
+        assert list(columns.mins) == [3, 10]
+        assert list(columns.maxes) == [5, 14]
+        assert file.readline() == "16-20\n"
+
+class TestExternalMerge:
+    EXAMPLE = "3-5\n10-14\n16-20\n12-18\n\n1\n5\n8\n11\n17\n32\n"
+    
+    def test_merged_ranges_in_memory(self):
+        """Test merging the example when everything fits in one run."""
+        file = io.StringIO(self.EXAMPLE)
+        assert list(iter_merged_ranges_external(file)) == [(3, 5), (10, 20)]
+    
+    def test_merged_ranges_spilled(self):
+        """Test merging the example with runs spilled to disk."""
+        for run_size in (1, 2, 3):
+            file = io.StringIO(self.EXAMPLE)
+            assert list(iter_merged_ranges_external(file, run_size)) == [(3, 5), (10, 20)]
+    
+    def test_numbers_follow_ranges(self):
+        """Test that the file is left at the numbers after the ranges are read."""
+        file = io.StringIO(self.EXAMPLE)
+        list(iter_merged_ranges_external(file, 2))
+        assert list(iter_numbers(file)) == [1, 5, 8, 11, 17, 32]
+    
+    def test_count_unique_numbers_external(self):
+        """Test that the count matches count_unique_numbers_in_ranges."""
+        assert count_unique_numbers_external(io.StringIO(self.EXAMPLE), 2) == 14
+    
+    def test_adjacent_across_runs(self):
+        """Test that adjacent ranges in different runs are merged."""
+        file = io.StringIO("5-6\n1-2\n3-4\n")
+        assert list(iter_merged_ranges_external(file, 1)) == [(1, 6)]
+    
+    def test_empty(self):
+        """Test a file with no ranges."""
+        assert list(iter_merged_ranges_external(io.StringIO("\n"))) == []
+        assert count_unique_numbers_external(io.StringIO("")) == 0
+    
+    def test_random_ranges(self):
+        """Test random ranges against merge_ranges with several run sizes."""
+        rng = random.Random(2)
+        ranges = [Range(start, start + rng.randint(0, 30)) for start in (rng.randint(0, 500) for _ in range(80))]
+        text = "".join(f"{r.min}-{r.max}\n" for r in ranges)
+        for run_size in (1, 7, 100):
+            assert list(iter_merged_ranges_external(io.StringIO(text), run_size)) == merge_ranges(ranges)
+
+class TestCountNumbersInRangesParallel:
+    RANGES = [Range(3, 5), Range(10, 14), Range(16, 20), Range(12, 18)]
+    
+    def test_count_example(self):
+        """Test counting the example numbers on two workers."""
+        assert count_numbers_in_ranges_parallel([1, 5, 8, 11, 17, 32], self.RANGES, workers=2) == 3
+    
+    def test_matches_serial_count(self):
+        """Test that small chunks on several workers match the serial count."""
+        rng = random.Random(3)
+        ranges = [Range(start, start + rng.randint(0, 100)) for start in (rng.randint(0, 10000) for _ in range(200))]
+        numbers = [rng.randint(-100, 10200) for _ in range(20000)]
+        expected = count_numbers_in_ranges(numbers, ranges)
+        assert count_numbers_in_ranges_parallel(numbers, ranges, workers=3, chunk_size=777) == expected
+    
+    def test_streamed_numbers(self):
+        """Test counting numbers read lazily from a file."""
+        file = io.StringIO("1\n5\n8\n11\n17\n32\n")
+        assert count_numbers_in_ranges_parallel(iter_numbers(file), self.RANGES, workers=2, chunk_size=2) == 3
+    
+    def test_numbers_beyond_int64(self):
+        """Test that chunks with numbers beyond int64 are still counted."""
+        numbers = [5, 2 ** 70, 11, 40]
+        assert count_numbers_in_ranges_parallel(numbers, self.RANGES, workers=2, chunk_size=2) == 2
+    
+    def test_empty(self):
+        """Test counting with no numbers or no ranges."""
+        assert count_numbers_in_ranges_parallel([], self.RANGES, workers=2) == 0
+        assert count_numbers_in_ranges_parallel([1, 2], [], workers=2) == 0
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -83,7 +83,8 @@ class TestReadFileColumnsStacked:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
-from Day6 import read_file_columns, apply_operation
+from Day6 import read_file_columns, read_file_columns_stacked, apply_operation, parse_worksheet
+from Day6 import read_file_columns_stacked_numpy, stacked_columns_from_lines, stacked_columns_from_lines_numpy
 
 class TestApplyOperation:
     def test_apply_operation_addition(self):
@@ -192,6 +193,78 @@ class TestReadFileColumns:
         assert columns[0] == [1, 2, 3]
         assert operations == ['+']
 
+class TestParseWorksheet:
+    WORKSHEET = "123 328  51 64 \n 45 64  387 23 \n  6 98  215 314\n*   +   *   +  \n"
+    
+    def test_parse_worksheet_text(self):
+        """Test that both views match the separate parsers on a text file."""
+        import io
+        columns, operations, stacked_columns, stacked_operations = parse_worksheet(io.StringIO(self.WORKSHEET))
+        assert (columns, operations) == read_file_columns(io.StringIO(self.WORKSHEET))
+        assert (stacked_columns, stacked_operations) == read_file_columns_stacked(io.StringIO(self.WORKSHEET))
+    
+    def test_parse_worksheet_bytes(self):
+        """Test parsing the worksheet from a binary file."""
+        import io
+        columns, operations, stacked_columns, stacked_operations = parse_worksheet(io.BytesIO(self.WORKSHEET.encode()))
+        assert columns[0] == [123, 45, 6]
+        assert operations == ['*', '+', '*', '+']
+        assert stacked_columns == [[356, 24, 1], [8, 248, 369], [175, 581, 32], [4, 431, 623]]
+        assert stacked_operations == ['*', '+', '*', '+']
+    
+    def test_parse_worksheet_windows_line_endings(self):
+        """Test that carriage returns do not change the result."""
+        import io
+        expected = parse_worksheet(io.StringIO(self.WORKSHEET))
+        assert parse_worksheet(io.BytesIO(self.WORKSHEET.replace("\n", "\r\n").encode())) == expected
+
+class TestReadFileColumnsStackedNumpy:
+    WORKSHEET = TestParseWorksheet.WORKSHEET
+    
+    def test_numpy_example(self):
+        """Test that the NumPy path reads the example worksheet."""
+        import io
+        stacked_columns, stacked_operations = read_file_columns_stacked_numpy(io.StringIO(self.WORKSHEET))
+        assert stacked_columns == [[356, 24, 1], [8, 248, 369], [175, 581, 32], [4, 431, 623]]
+        assert stacked_operations == ['*', '+', '*', '+']
+    
+    def test_numpy_matches_loop_on_odd_layouts(self):
+        """Test layouts with gaps, stray characters and operators away from the numbers."""
+        worksheets = [
+            ["1 2", "3 4", "* +"],
+            ["12  ", " 3 4", "  * "],
+            ["1a 2", "3  4", " +  "],
+            ["5  6", "7  8", "   *"],
+            ["  ", "  "],
+            ["9"],
+        ]
+        for lines in worksheets:
+            assert stacked_columns_from_lines_numpy(lines) == stacked_columns_from_lines(lines)
+    
+    def test_numpy_many_rows(self):
+        """Test that numbers taller than 18 digits are built exactly."""
+        lines = ["9 1"] * 25 + ["+ *"]
+        stacked_columns, stacked_operations = stacked_columns_from_lines_numpy(lines)
+        assert stacked_columns == [[int("9" * 25)], [int("1" * 25)]]
+        assert (stacked_columns, stacked_operations) == stacked_columns_from_lines(lines)
+    
+    def test_numpy_operator_carried_over_empty_problems(self):
+        """Test that an operator in a problem without numbers goes to the problem on its left."""
+        lines = ["1 2    ", "3 4    ", "+   + *"]
+        assert stacked_columns_from_lines_numpy(lines) == ([[13], [24]], ['+', '*'])
+        assert stacked_columns_from_lines_numpy(lines) == stacked_columns_from_lines(lines)
+    
+    def test_numpy_matches_loop_on_random_layouts(self):
+        """Test random layouts of digits, spaces, stray letters and operators."""
+        import random
+        rng = random.Random(5)
+        for _ in range(2000):
+            width = rng.randint(0, 14)
+            lines = [''.join(rng.choice('      0123456789a') for _ in range(rng.randint(0, width)))
+                     for _ in range(rng.randint(1, 5))]
+            lines.append(''.join(rng.choice('  ++*a1') for _ in range(rng.randint(0, width))))
+            assert stacked_columns_from_lines_numpy(lines) == stacked_columns_from_lines(lines)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 